@@ -380,6 +380,12 @@ Signed first gram  code + mid + vid + gn + gc + body + sig
 Signed other grams  code + mid + vid + gn + body + sig
 Add sign and verify methods
 
+Add retry tymers to TymeeMemoer. Keep outstanding retry deadlines in one
+heapq of (stop tyme, key) duples rather than a Tymer instance per gram so
+.serviceTymers only pops the expired deadlines from the front, O(k log n) for k
+expired of n pending, instead of checking every tymer each pass. Cancel lazily
+by tombstoning the key so acks need not search the heap.
+
 
 
 """
@@ -393,6 +399,7 @@ from collections import deque, namedtuple
 from contextlib import contextmanager
 from base64 import urlsafe_b64encode as encodeB64
 from base64 import urlsafe_b64decode as decodeB64
+from base64 import b64decode
 from dataclasses import dataclass, astuple, asdict
 
 from ... import hioing, help
@@ -401,6 +408,87 @@ from ...help import helping
 
 logger = help.ogler.getLogger()
 
+# shared immutable .txbs duple that means nothing left to send so resetting
+# .txbs allocates nothing
+_TXBS_IDLE = (b"", None)
+
+# errnos on send that mean far peer is unavailable so drop gram.
+# When uxd, ECONNREFUSED and ENOENT mean dest uxd file path is not available.
+_DROPPABLE_ERRNOS = frozenset((errno.ECONNREFUSED,
+                               errno.ENOENT,
+                               errno.ECONNRESET,
+                               errno.ENETRESET,
+                               errno.ENETUNREACH,
+                               errno.EHOSTUNREACH,
+                               errno.ENETDOWN,
+                               errno.EHOSTDOWN,
+                               errno.ETIMEDOUT,
+                               errno.ETIME))
+
+# errnos on receive that mean nothing received so try again later
+_RX_DROPPABLE_ERRNOS = frozenset((errno.ECONNREFUSED,
+                                  errno.ECONNRESET,
+                                  errno.ENETRESET,
+                                  errno.ENETUNREACH,
+                                  errno.EHOSTUNREACH,
+                                  errno.ENETDOWN,
+                                  errno.EHOSTDOWN,
+                                  errno.ETIMEDOUT,
+                                  errno.ETIME,
+                                  errno.ENOBUFS,
+                                  errno.ENOMEM))
+
+
+def _intToB64b(i, l):
+    """Converts int i to l Base64 bytes with the C base64 codec instead of a
+    Python loop per char when l chars align on 24 bit boundary (l % 4 == 0)
+    as for gram number and gram count parts. Otherwise or when i needs more
+    than l chars falls back to helping.intToB64b.
+
+    Returns:
+        b64 (bytes): Base64 conversion of i prepadded with b'A' to l bytes
+
+    Parameters:
+        i (int): to be converted
+        l (int): min number of Base64 chars
+    """
+    if not l % 4:
+        try:
+            return encodeB64(i.to_bytes(3 * l // 4, "big"))
+        except OverflowError:  # needs more than l chars
+            pass
+    return helping.intToB64b(i, l=l)
+
+
+# Base64 url safe alphabet, the only chars _b64ToInt accepts
+_B64_URL_CHARS = "".join(helping.B64ChrByIdx[i] for i in range(64)).encode()
+
+
+def _b64ToInt(b):
+    """Converts Base64 bytes b to int with the C base64 codec instead of a
+    Python loop per char when b aligns on 24 bit boundary (len(b) % 4 == 0)
+    as for gram number and gram count parts. Otherwise falls back to
+    helping.b64ToInt.
+
+    Returns:
+        i (int): conversion of b
+
+    Parameters:
+        b (bytes | bytearray): Base64 url safe chars to be converted
+
+    Raises hioing.MemoerError when b has non Base64 url safe chars. The codec
+    alone would also accept standard alphabet chars + and / and = padding.
+    """
+    try:
+        if b and not len(b) % 4:
+            if b.translate(None, _B64_URL_CHARS):  # chars outside url safe
+                raise ValueError("Not Base64 url safe.")
+            return int.from_bytes(b64decode(b, altchars=b"-_", validate=True), "big")
+        return helping.b64ToInt(b)
+    except (ValueError, KeyError) as ex:  # binascii.Error is ValueError
+        raise hioing.MemoerError(f"Invalid Base64 {bytes(b)}.") from ex
+
+
 # namedtuple of ints (major: int, minor: int)
 Versionage = namedtuple("Versionage", "major minor")
 
@@ -517,6 +605,11 @@ class Memoer(hioing.Mixin):
         Sizes (dict): gram head part sizes Sizage instances keyed by gram codes
         MaxMemoSize (int): absolute max memo size
         MaxGramCount (int): absolute max gram count
+        BatchSize (int): max grams per batched send or receive
+        MaxServiceIters (int): max iterations of each greedy service loop per
+            call so that one busy Memoer can not monopolize its scheduler.
+            Each receive or gram send iteration handles up to .BatchSize grams.
+            Each memo iteration rends one memo.
 
 
     Inherited Attributes:
@@ -557,9 +650,9 @@ class Memoer(hioing.Mixin):
         txgs (deque): grams to transmit, each entry is duple of form:
                 (gram: bytes, dst: str).
         txbs (tuple): current transmisstion duple of form:
-            (gram: bytearray, dst: str). gram bytearray may hold untransmitted
-            portion when Encodesdatagram is not able to be sent all at once so can
-            keep trying. Nothing to send indicated by (bytearray(), None)
+            (gram: bytes | memoryview, dst: str). gram may hold memoryview
+            of untransmitted portion when datagram is not able to be sent all
+            at once so can keep trying. Nothing to send indicated by (b"", None)
             for (gram, dst)
         echos (deque): holding echo receive duples for testing. Each duple of
                        form: (gram: bytes, dst: str).
@@ -570,6 +663,15 @@ class Memoer(hioing.Mixin):
         _curt (bool): see curt property
         _size (int): see size property
         _verific (bool): see verific property
+        _rxDirty (dict): dirty mids in .rxgs as insertion ordered set, that is,
+            mids that received a new gram or count since their last fuse
+            attempt. Only dirty mids can newly complete so each pass over
+            .rxgs only visits these instead of every incomplete memo.
+        _epoch (int): progress counter bumped whenever work is queued or
+            progresses, that is, when a gram is received, a memo is fused, a
+            memo or gram is queued for tx, or a gram is sent or dropped. An
+            unchanged ._epoch across a service pass means that pass made no
+            progress so callers may wait rather than service again.
 
 
 
@@ -602,6 +704,8 @@ class Memoer(hioing.Mixin):
     MaxMemoSize = 4294967295 # (2**32-1) absolute max memo payload size
     MaxGramCount = 16777215 # (2**24-1) absolute max gram count
     MaxGramSize = 65535  # (2**16-1)  Overridden in subclass
+    BatchSize = 64  # max grams per batched send or receive
+    MaxServiceIters = 64  # max iterations per greedy service call
 
 
     def __init__(self, *,
@@ -662,10 +766,10 @@ class Memoer(hioing.Mixin):
             txgs (deque): grams to transmit, each entry is duple of form:
                 (gram: bytes, dst: str). Grams include gram headers.
             txbs (tuple): current transmisstion duple of form:
-                (gram: bytearray, dst: str). gram bytearray may hold untransmitted
-                portion when datagram is not able to be sent all at once so can
-                keep trying. Nothing to send indicated by (bytearray(), None)
-                for (gram, dst)
+                (gram: bytes | memoryview, dst: str). gram memoryview may hold
+                untransmitted portion when datagram is not able to be sent all
+                at once so can keep trying. Nothing to send indicated by
+                (b"", None) for (gram, dst)
             code (bytes): gram code for gram header
             curt (bool): True means when rending for tx encode header in base2
                          False means when rending for tx encode header in base64
@@ -682,6 +786,8 @@ class Memoer(hioing.Mixin):
         # initialize attributes
         self.version = version if version is not None else self.Version
         self.rxgs = rxgs if rxgs is not None else dict()
+        self._rxDirty = dict.fromkeys(self.rxgs)  # mids with new grams in fifo order
+        self._epoch = 0  # bumped on progress
         self.sources = sources if sources is not None else dict()
         self.counts = counts if counts is not None else dict()
         self.vids = vids if vids is not None else dict()
@@ -689,7 +795,7 @@ class Memoer(hioing.Mixin):
 
         self.txms = txms if txms is not None else deque()
         self.txgs = txgs if txgs is not None else deque()
-        self.txbs = txbs if txbs is not None else (bytearray(), None)
+        self.txbs = txbs if txbs is not None else _TXBS_IDLE
 
         self.echos = deque()  # only used in testing as echoed tx
 
@@ -920,17 +1026,24 @@ class Memoer(hioing.Mixin):
         When valid recognized header, strips header bytes from front of gram
         leaving the gram body part bytearray.
 
+        Only signed grams pay for stripping and verifying the signature.
+        Unsigned grams have no signature so the signed portion is not copied.
+
         Parameters:
             gram (bytearray): memo gram from which to parse and strip its header.
 
 
         """
+        if not gram:  # empty such as from zero length datagram so no head
+            raise hioing.MemoerError("Empty gram.")
         curt = self.wiff(gram)  # rx gram encoding True=B2 or False=B64
         if curt:  # base2 binary encoding
             if len(gram) < 2:  # assumes len(code) must be 2
                 raise hioing.MemoerError(f"Gram length={len(gram)} to short to "
                                          f"hold code.")
             code = helping.codeB2ToB64(gram, 2)  # assumes len(code) must be 2
+            if code not in self.Sizes:
+                raise hioing.MemoerError(f"Unrecognized gram {code=}.")
             if self.verific and code not in self.Sodex:  # must be signed
                 raise hioing.MemoerError(f"Unsigned gram {code =} when signed "
                                          f"required.")
@@ -957,22 +1070,32 @@ class Memoer(hioing.Mixin):
                                              f"gram < {hs + ns + 1}.")
                 neck = gram[cms+vs+ns:cms+vs+2*ns]  # slice takes a copy
                 gc = int.from_bytes(neck)  # convert to int
-                sig = encodeB64(gram[-ss if ss else len(gram):])   # last ss bytes are signature
-                del gram[-ss if ss else len(gram):]  # strip sig
-                signed = bytes(gram[:])  # copy signed portion of gram
+                sig, signed = b"", None  # unsigned so no sig to strip or copy
+                if ss:  # last ss bytes are signature
+                    sig = encodeB64(gram[-ss:])
+                    del gram[-ss:]  # strip sig
+                    signed = bytes(gram)  # copy signed portion of gram
                 del gram[:hs-ss+ns]  # strip of fore head leaving body in gram
             else:  # non-first gram no neck
                 gc = None
-                sig = encodeB64(gram[-ss if ss else len(gram):])
-                del gram[-ss if ss else len(gram):]  # strip sig
-                signed = bytes(gram[:])  # copy signed portion of gram
+                sig, signed = b"", None  # unsigned so no sig to strip or copy
+                if ss:  # last ss bytes are signature
+                    sig = encodeB64(gram[-ss:])
+                    del gram[-ss:]  # strip sig
+                    signed = bytes(gram)  # copy signed portion of gram
                 del gram[:hs-ss]  # strip of fore head leaving body in gram
 
         else:  # base64 text encoding
             if len(gram) < 2:  # assumes len(code) must be 2
                 raise hioing.MemoerError(f"Gram length={len(gram)} to short to "
                                          f"hold code.")
-            code = gram[:2].decode()  # assumes len(code) must be 2
+            try:
+                code = gram[:2].decode()  # assumes len(code) must be 2
+            except UnicodeDecodeError as ex:
+                raise hioing.MemoerError(f"Non ascii gram code "
+                                         f"{bytes(gram[:2])}.") from ex
+            if code not in self.Sizes:
+                raise hioing.MemoerError(f"Unrecognized gram {code=}.")
             if self.verific and code not in self.Sodex:  # must be signed
                 raise hioing.MemoerError(f"Unsigned gram {code =} when signed "
                                          f"required.")
@@ -982,24 +1105,31 @@ class Memoer(hioing.Mixin):
                 raise hioing.MemoerError(f"Not enough rx bytes for b64 gram"
                                          f" < {hs + 1}.")
 
-            mid = bytes(gram[:cs+ms]).decode()  # fully qualified with prefix code
-            vid = bytes(gram[cs+ms:cs+ms+vs]).decode() # must be on 24 bit boundary
-            gn = helping.b64ToInt(gram[cs+ms+vs:cs+ms+vs+ns])
+            try:
+                mid = gram[:cs+ms].decode()  # fully qualified with prefix code
+                vid = gram[cs+ms:cs+ms+vs].decode() # must be on 24 bit boundary
+            except UnicodeDecodeError as ex:
+                raise hioing.MemoerError("Non ascii mid or vid in gram.") from ex
+            gn = _b64ToInt(gram[cs+ms+vs:cs+ms+vs+ns])
             if gn == 0:  # first (zeroth) gram so get neck
                 if len(gram) < hs + ns + 1:
                     raise hioing.MemoerError(f"Not enough rx bytes for b64 "
                                              f"gram < {hs + ns + 1}.")
                 neck = gram[cs+ms+vs+ns:cs+ms+vs+2*ns]  # slice takes a copy
-                gc = helping.b64ToInt(neck)  # convert to int
-                sig = bytes(gram[-ss if ss else len(gram):])   # last ss bytes are signature
-                del gram[-ss if ss else len(gram):]  # strip sig
-                signed = bytes(gram[:])  # copy signed portion of gram
+                gc = _b64ToInt(neck)  # convert to int
+                sig, signed = b"", None  # unsigned so no sig to strip or copy
+                if ss:  # last ss bytes are signature
+                    sig = bytes(gram[-ss:])
+                    del gram[-ss:]  # strip sig
+                    signed = bytes(gram)  # copy signed portion of gram
                 del gram[:hs-ss+ns]  # strip of fore head leaving body in gram
             else:  # non-first gram no neck
                 gc = None
-                sig = bytes(gram[-ss if ss else len(gram):])
-                del gram[-ss if ss else len(gram):]  # strip sig
-                signed = bytes(gram[:])  # copy signed portion of gram
+                sig, signed = b"", None  # unsigned so no sig to strip or copy
+                if ss:  # last ss bytes are signature
+                    sig = bytes(gram[-ss:])
+                    del gram[-ss:]  # strip sig
+                    signed = bytes(gram)  # copy signed portion of gram
                 del gram[:hs-ss]  # strip of fore head leaving body in gram
 
         if sig:  # signature not empty
@@ -1022,10 +1152,15 @@ class Memoer(hioing.Mixin):
                             indicates nothing to receive of form (b'', None)
 
         Returns:
-            duple (tuple): of form (data: bytes, src: str) where data is the
-                bytes of received data and src is the source address.
+            duple (tuple): of form (data: bytes | bytearray, src: str) where
+                data is the received data and src is the source address.
                 When no data the duple is (b'', None) unless echoic is True
                 then pop off echo from .echos
+
+        A returned bytearray is handed over to the caller which strips it in
+        place uncopied. So an override must never reuse, keep, or later
+        mutate a bytearray it returns such as a receive scratch buffer. Return
+        a fresh bytearray or bytes instead.
         """
 
         if echoic:
@@ -1039,6 +1174,42 @@ class Memoer(hioing.Mixin):
         return result
 
 
+    def receiveMany(self, *, echoic=False):
+        """Attempts to receive up to .BatchSize grams.
+        Default calls .receive once per gram. Override in transport subclass to
+        receive the whole batch with one batch system call such as recvmmsg.
+
+        Parameters:
+            echoic (bool): True means use .echos in .receive debugging purposes
+                            where echo is duple of form: (gram: bytes, src: str)
+                           False means do not use .echos
+
+        Returns:
+            grams (list[tuple]): duples of form (gram: bytes | bytearray,
+                src: str) in order received. Empty when no data to receive.
+                A bytearray gram is handed over as with .receive so the
+                transport must never reuse it since it is stripped in place.
+
+        Like recvmmsg, an error is only raised when nothing was received.
+        An error after some grams were received ends the batch so that the
+        error is raised on the next call.
+        """
+        grams = []
+        while len(grams) < self.BatchSize:
+            try:
+                gram, src = self.receive(echoic=echoic)
+            except socket.error:
+                if grams:  # report error on next call
+                    break
+                raise
+
+            if not gram:  # no more received data
+                break
+            grams.append((gram, src))
+
+        return grams
+
+
     def _serviceOneReceived(self, *, echoic=False):
         """Service one received duple (raw, src) raw packet data. Always returns
         complete datagram.
@@ -1060,52 +1231,92 @@ class Memoer(hioing.Mixin):
         try:
             gram, src = self.receive(echoic=echoic)  # if no data the duple is (b'', None)
         except socket.error as ex:  # OSError.errno always .args[0] for compat
-            #if (ex.args[0] == (errno.ECONNREFUSED,
-                               #errno.ECONNRESET,
-                               #errno.ENETRESET,
-                               #errno.ENETUNREACH,
-                               #errno.EHOSTUNREACH,
-                               #errno.ENETDOWN,
-                               #errno.EHOSTDOWN,
-                               #errno.ETIMEDOUT,
-                               #errno.ETIME,
-                               #errno.ENOBUFS,
-                               #errno.ENOMEM)):
-                #return False  # no received data
-            #else:
+            if ex.args[0] in _RX_DROPPABLE_ERRNOS:  # transient or far peer problem
+                return False  # no received data
             raise  # should not happen
 
         if not gram:  # no received data
             return False  # so try again later
 
-        gram = bytearray(gram)# make copy bytearray so can strip off header
+        self._serviceOneRxGram(gram, src)
+        return True  # received data so can try again now
+
+
+    def _serviceManyReceived(self, *, echoic=False):
+        """Service one batch of received duples (raw, src) from .receiveMany.
+
+        Returns:
+            result (bool):  True means full batch received so there may be
+                                more to receive now
+                            False means partial or empty batch so all received
+                                data has been taken so try again later
+
+                        return enables greedy callers to keep calling until no
+                        more data to receive from transport
+
+        Parameters:
+            echoic (bool): True means use .echos in .receive debugging purposes
+                            where echo is duple of form: (gram: bytes, src: str)
+                           False means do not use .echos default is duple that
+                            indicates nothing to receive of form (b'', None)
+
+        """
+        try:
+            grams = self.receiveMany(echoic=echoic)
+        except socket.error as ex:  # OSError.errno always .args[0] for compat
+            if ex.args[0] in _RX_DROPPABLE_ERRNOS:  # transient or far peer problem
+                return False  # no received data
+            raise  # should not happen
+
+        for gram, src in grams:
+            self._serviceOneRxGram(gram, src)
+
+        return (len(grams) >= self.BatchSize)
+
+
+    def _serviceOneRxGram(self, gram, src):
+        """Service one received gram from src. Parses and strips gram header
+        then saves gram body in .rxgs to be fused later. Drops invalid grams.
+
+        Returns:
+            result (bool):  True means gram valid and saved
+                            False means gram invalid and dropped
+
+        Parameters:
+            gram (bytes | bytearray): received raw gram with header.
+                A bytearray is owned by this call and stripped in place.
+            src (str): source address of gram
+        """
+        if type(gram) is not bytearray:  # bytearray is handed over so no copy
+            gram = bytearray(gram)# make copy bytearray so can strip off header
 
         try:
             mid, vid, gn, gc = self.pick(gram)  # parse and strip off head leaving body
         except hioing.MemoerError as ex: # invalid gram so drop
             logger.error("Unrecognized Memoer gram from %s.\n %s.", src, ex)
-            return True  # did receive data so can try again now
+            return False  # dropped
 
-        if mid not in self.rxgs:
-            self.rxgs[mid] = dict()
+        grams = self.rxgs.get(mid)  # one lookup for common case of seen mid
+        if grams is None:  # first gram received for mid
+            grams = self.rxgs[mid] = dict()
+            # vid and src are only ever saved from first gram for mid.
+            # assumes unique mid across all possible sources. No replay by
+            # different source only first source for a given mid is ever recognized
+            self.vids.setdefault(mid, vid)
+            self.sources.setdefault(mid, src)  # save source for later
 
         # save stripped gram to be fused later
-        if gn not in self.rxgs[mid]:  # make idempotent first only no replay
-            self.rxgs[mid][gn] = gram  # index body by its gram number
+        if gn not in grams:  # make idempotent first only no replay
+            grams[gn] = gram  # index body by its gram number
+            self._rxDirty[mid] = None  # may now be complete so try fuse
 
         if gc is not None:
             if mid not in self.counts:  # make idempotent first only no replay
                 self.counts[mid] = gc  # save gram count for mid
+                self._rxDirty[mid] = None  # may now be complete so try fuse
 
-        if mid not in self.vids:
-            self.vids[mid] = vid
-
-        # assumes unique mid across all possible sources. No replay by different
-        # source only first source for a given mid is ever recognized
-        if mid not in self.sources:  # make idempotent first only no replay
-            self.sources[mid] = src  # save source for later
-
-        return True  # received valid so can try again now
+        self._epoch += 1
+        return True  # received valid
 
 
     def serviceReceivesOnce(self, *, echoic=False):
@@ -1130,8 +1341,8 @@ class Memoer(hioing.Mixin):
                            False means do not use .echos default is duple that
                             indicates nothing to receive of form (b'', None)
         """
-        while self.opened:
-            if not self._serviceOneReceived(echoic=echoic):
+        for _ in range(self.MaxServiceIters):  # bounded so cannot monopolize
+            if not (self.opened and self._serviceManyReceived(echoic=echoic)):
                 break
 
 
@@ -1152,32 +1363,58 @@ class Memoer(hioing.Mixin):
         if len(grams) < cnt:  # must be missing one or more grams
             return None
 
-        memo = bytearray()
-        for i in range(cnt):  # iterate in numeric order, items are insertion ordered
-            memo.extend(grams[i])  # extend memo with gram body part at gram i
-
-        return memo.decode()  # convert bytearray to str
+        # join in numeric order since items are insertion ordered not numeric
+        # ordered. join sizes and copies into result once
+        return b"".join([grams[i] for i in range(cnt)]).decode()  # convert to str
 
 
 
     def _serviceOnceRxGrams(self):
         """Service one pass over .rxgs dict for each unique mid in .rxgs
 
-        Deleting an item from a dict at a key (since python dicts are key
-        insertion ordered) means that the next time an item is created it will
-        be last.
+        Returns:
+            result (bool): True means at least one memo fused onto .rxms
+                           False means no memo fused this pass
+
+        Only visits dirty mids in ._rxDirty, in FIFO order, since only a mid
+        that received a new gram or count since its last fuse attempt can
+        newly complete. A mid whose memo is still incomplete goes clean until
+        its next gram so idle incomplete memos cost nothing per pass. A mid
+        whose memo is fused is removed with its entries in .rxgs, .counts,
+        .sources, and .vids. So is a mid whose complete memo is invalid since
+        its fused body is not utf-8 and so can never fuse. Dropping it rather
+        than raising keeps the later dirty mids of the pass from being lost.
         """
-        for i, mid in enumerate(list(self.rxgs.keys())):  # items may be deleted in loop
+        fused = dropped = False
+        dirty, self._rxDirty = self._rxDirty, dict()  # swap so no snapshot copy
+        for mid in dirty:
+            grams = self.rxgs.get(mid)
+            if grams is None:  # stale since removed elsewhere so drop
+                continue
             # if mid then grams dict at mid must not be empty
-            if not mid in self.counts:  # missing first gram so skip
+            cnt = self.counts.get(mid)
+            if cnt is None:  # missing first gram so wait for it
                 continue
-            memo = self.fuse(self.rxgs[mid], self.counts[mid])
-            if memo is not None:  # allows for empty "" memo for some src
+            try:
+                memo = self.fuse(grams, cnt)
+            except UnicodeDecodeError as ex:  # invalid memo so drop
+                logger.error("Invalid Memoer memo from %s.\n %s.",
+                             self.sources[mid], ex)
+                dropped = True
+            else:
+                if memo is None:  # incomplete so wait for more grams
+                    continue
+                # allows for empty "" memo for some src
                 self.rxms.append((memo, self.sources[mid], self.vids[mid]))
-                del self.rxgs[mid]
-                del self.counts[mid]
-                del self.sources[mid]
-                del self.vids[mid]
+                fused = True
+            del self.rxgs[mid]
+            del self.counts[mid]
+            del self.sources[mid]
+            del self.vids[mid]
+
+        if fused or dropped:
+            self._epoch += 1
+        return fused
 
 
     def serviceRxGramsOnce(self):
@@ -1197,26 +1434,13 @@ class Memoer(hioing.Mixin):
             self._serviceOnceRxGrams()
 
 
-    def _serviceOneRxMemo(self):
-        """Service one duple from .rxMsgs deque
-
-        Returns:
-            duple (tuple | None): of form (memo: str, src: str) if any
-                                  otherwise None
-
-        """
-        return (self.rxms.popleft())  # raises IndexError if empty deque
-
-
     def serviceRxMemosOnce(self):
         """Service memos in .rxms deque once (non-greedy one memo) if any
 
         Override in subclass to handle result and put it somewhere
         """
-        try:
-            memo, src, vid = self._serviceOneRxMemo()
-        except IndexError:
-            pass
+        if self.rxms:
+            memo, src, vid = self.rxms.popleft()
 
 
     def serviceRxMemos(self):
@@ -1225,7 +1449,7 @@ class Memoer(hioing.Mixin):
         Override in subclass to handle result(s) and put them somewhere
         """
         while self.rxms:
-            memo, src, vid = self._serviceOneRxMemo()
+            memo, src, vid = self.rxms.popleft()
 
 
     def serviceAllRxOnce(self):
@@ -1263,6 +1487,43 @@ class Memoer(hioing.Mixin):
         return len(txbs)  # all sent
 
 
+    def sendMany(self, batch, *, echoic=False):
+        """Attempts to send each (gram, dst) duple in batch in order.
+        Default calls .send once per gram. Override in transport subclass to
+        send the whole batch with one batch system call such as sendmmsg.
+
+        Returns:
+            count (int): number of grams from front of batch consumed. A gram
+                is consumed when completely sent or when its unsent remainder
+                has been put in .txbs to be sent later. Grams after count were
+                not sent so caller may send them later.
+
+        Parameters:
+            batch (list[tuple]): duples of form (gram: bytes, dst: str)
+            echoic (bool): True means echo sends into receives via. echos
+                           False measn do not echo
+
+        Like sendmmsg, an error is only raised when the first gram in batch
+        fails. An error on a later gram stops the batch at that gram so that
+        the error is raised when the caller next tries to send it.
+        """
+        for i, (gram, dst) in enumerate(batch):
+            try:
+                cnt = self.send(gram, dst, echoic=echoic)
+            except socket.error:
+                if i:  # report error on next call when gram is first in batch
+                    return i
+                raise
+
+            if cnt < len(gram):  # incomplete
+                if cnt:  # partial so put remainder in .txbs to send later
+                    self.txbs = (memoryview(gram)[cnt:], dst)  # no copy
+                    return i + 1
+                return i  # nothing sent so try again later
+
+        return len(batch)
+
+
 
     def memoit(self, memo, dst, vid=None):
         """Append (memo, dst, vid) tuple to .txms deque
@@ -1273,6 +1534,7 @@ class Memoer(hioing.Mixin):
             vid (str | None): verifiable ID for signing grams
         """
         self.txms.append((memo, dst, vid))
+        self._epoch += 1
 
 
     def sign(self, ser, vid):
@@ -1309,7 +1571,7 @@ class Memoer(hioing.Mixin):
              non-first grams have just head overhead hs so bs is bigger by ns
         """
         grams = []
-        memo = bytearray(memo.encode()) # convert and copy to bytearray
+        memo = memo.encode() # convert to bytes
         # self.size is max gram size
         cs, ms, vs, ss, ns, hs = self.Sizes[self.code]  # cs ms vs ss ns hs
         ps = (3 - ((ms) % 3)) % 3  # net pad size for mid
@@ -1349,23 +1611,39 @@ class Memoer(hioing.Mixin):
         if self.curt:
             neck = gc.to_bytes(ns)
         else:
-            neck = helping.intToB64b(gc, l=ns)
+            neck = _intToB64b(gc, l=ns)
 
+        if 0 < ml <= bs - ns:  # fast path whole memo fits in single first gram
+            if self.curt:
+                num = (0).to_bytes(ns)  # num size must always be neck size
+            else:
+                num = _intToB64b(0, l=ns)  # num size must always be neck size
+            gram = mid + vid + num + neck + memo
+            if ss:  # sign
+                sig = self.sign(gram, vid)
+                if self.curt:
+                    sig = decodeB64(sig)
+                gram = gram + sig
+            return [gram]
+
+        memo = memoryview(memo)  # view so slices not copied
         gn = 0
-        while memo:
+        start = 0  # offset into memo of start of next gram body part
+        while start < ml:
             if self.curt:
                 num = gn.to_bytes(ns)  # num size must always be neck size
             else:
-                num = helping.intToB64b(gn, l=ns)  # num size must always be neck size
+                num = _intToB64b(gn, l=ns)  # num size must always be neck size
 
             head = mid + vid + num
 
             if gn == 0:
-                gram = head + neck + memo[:bs-ns]  # copy slice past end just copies to end
-                del memo[:bs-ns]  # del slice past end just deletes to end
+                end = start + bs - ns
+                gram = head + neck + memo[start:end]  # slice past end just views to end
             else:
-                gram = head + memo[:bs]  # copy slice past end just copies to end
-                del memo[:bs]  # del slice past end just deletes to end
+                end = start + bs
+                gram = head + memo[start:end]  # slice past end just views to end
+            start = end
 
             if ss:  # sign
                 sig = self.sign(gram, vid)
@@ -1395,8 +1673,14 @@ class Memoer(hioing.Mixin):
         """
         memo, dst, vid = self.txms.popleft()  # raises IndexError if empty deque
 
-        for gram in self.rend(memo, vid):  # partition memo into gram parts with head
-            self.txgs.append((gram, dst))  # append duples (gram: bytes, dst: str)
+        # partition memo into gram parts with head and append duples
+        # (gram: bytes, dst: str)
+        grams = self.rend(memo, vid)
+        if len(grams) == 1:  # fast path for common single gram memo
+            self.txgs.append((grams[0], dst))
+        else:
+            self.txgs.extend([(gram, dst) for gram in grams])
+        self._epoch += 1
 
 
     def serviceTxMemosOnce(self):
@@ -1412,7 +1696,9 @@ class Memoer(hioing.Mixin):
     def serviceTxMemos(self):
         """Service all outgoing memos in .txms deque if any (greedy)
         """
-        while self.txms:
+        for _ in range(self.MaxServiceIters):  # bounded so cannot monopolize
+            if not self.txms:
+                break
             self._serviceOneTxMemo()
 
 
@@ -1424,6 +1710,7 @@ class Memoer(hioing.Mixin):
             dst (str): address of remote destination of gram
         """
         self.txgs.append((gram, dst))
+        self._epoch += 1
 
 
     def _serviceOnceTxGrams(self, *, echoic=False):
@@ -1439,9 +1726,10 @@ class Memoer(hioing.Mixin):
             gram (bytes): is outgoing gram segment from associated memo
             dst (str): is far peer destination address
 
-        .txbs is duple of form: (gram: bytearray, dst: str)
+        .txbs is duple of form: (gram: bytes | memoryview, dst: str)
         where:
-            gram (bytearray): holds incompletly sent gram portion if any
+            gram (bytes | memoryview): holds incompletly sent gram portion
+                if any as memoryview onto original gram so remainder not copied
             dst (str | None): destination or None if last completely sent
 
         Returns:
@@ -1460,6 +1748,10 @@ class Memoer(hioing.Mixin):
         This accounts for datagram protocols that expect continuing attempts to
         send remainder of a datagram when using nonblocking sends.
 
+        Once .txbs is empty, up to .BatchSize grams are pulled off the .txgs
+        deque and sent together with .sendMany. Any grams in the batch not
+        sent are put back at the front of .txgs in order to be sent later.
+
         When the far side peer is unavailable the gram is dropped. This means
         that unreliable transports need to have a timeour retry mechanism.
 
@@ -1468,57 +1760,102 @@ class Memoer(hioing.Mixin):
 
         """
         gram, dst = self.txbs
-        if dst == None:
-            try:
-                gram, dst = self.txgs.popleft()
-                gram = bytearray(gram)
-            except IndexError:
-                return False  # nothing more to send, return False to try later
+        if dst is None:  # no remainder so send batch of grams from .txgs
+            return self._serviceBatchTxGrams(echoic=echoic)
 
         cnt = 0
         try:
             cnt = self.send(gram, dst, echoic=echoic)  # assumes .opened == True
         except socket.error as ex:  # OSError.errno always .args[0] for compat
-            if (ex.args[0] in (errno.ECONNREFUSED,
-                               errno.ENOENT,
-                               errno.ECONNRESET,
-                               errno.ENETRESET,
-                               errno.ENETUNREACH,
-                               errno.EHOSTUNREACH,
-                               errno.ENETDOWN,
-                               errno.EHOSTDOWN,
-                               errno.ETIMEDOUT,
-                               errno.ETIME)):  # far peer problem
+            if ex.args[0] in _DROPPABLE_ERRNOS:  # far peer problem
                 # try again later usually won't work here so we log error
                 # and drop gram so as to allow grams to other destinations
                 # to get sent. When uxd, ECONNREFUSED and ENOENT means dest
                 # uxd file path is not available to send to.
                 logger.error("Error send from %s to %s\n %s\n",
                                                          self.name, dst, ex)
-                self.txbs = (bytearray(), None) # far peer unavailable, so drop.
+                self.txbs = _TXBS_IDLE # far peer unavailable, so drop.
                 dst = None  # dropped is same as all sent
+                self._epoch += 1
             else:
                 raise  # unexpected error
 
         if cnt:
-            del gram[:cnt]  # remove from buffer those bytes sent
-            if not gram:  # all sent
+            self._epoch += 1
+            gram = gram[cnt:]  # memoryview slice of unsent portion so no copy
+            if gram:  # incomplete so update remainder
+                self.txbs = (gram, dst)
+            else:  # all sent so idle which also releases view of sent gram
+                self.txbs = _TXBS_IDLE
                 dst = None  # indicate by setting dst to None
-            self.txbs = (gram, dst)  # update txbs to indicate if completely sent
 
         return (False if dst else True)  # incomplete return False, else True
 
 
+    def _serviceBatchTxGrams(self, *, echoic=False):
+        """Pull up to .BatchSize grams off .txgs and send them with .sendMany.
+        Unsent grams are put back at the front of .txgs in their original order.
+        When .sendMany raises an unexpected error, which it only does for the
+        first gram in batch, that gram is dropped and the error re-raised.
+
+        Parameters:
+           echoic (bool): True means echo sends into receives via. echos
+                           False measn do not echo
+
+        Returns:
+            result (bool):  True means whole batch sent so greedy callers can
+                                keep sending.
+                            False means batch send was incomplete or there are
+                                no grams in .txgs deque so try again later.
+        """
+        n = min(len(self.txgs), self.BatchSize)
+        if not n:
+            return False  # nothing more to send, return False to try later
+
+        popleft = self.txgs.popleft
+        batch = [popleft() for _ in range(n)]
+
+        cnt = 0
+        dropped = False
+        try:
+            cnt = self.sendMany(batch, echoic=echoic)  # assumes .opened == True
+        except socket.error as ex:  # OSError.errno always .args[0] for compat
+            if ex.args[0] in _DROPPABLE_ERRNOS:  # far peer problem
+                # drop first gram in batch whose far peer is unavailable so
+                # as to allow grams to other destinations to get sent.
+                logger.error("Error send from %s to %s\n %s\n",
+                                                   self.name, batch[0][1], ex)
+                cnt = 1  # dropped is same as sent
+                dropped = True
+            else:
+                # unexpected error on first gram so drop it, as a lone send
+                # would, and put back the rest so it can not block .txgs
+                logger.error("Error send from %s to %s\n %s\n",
+                                                   self.name, batch[0][1], ex)
+                self.txgs.extendleft(reversed(batch[1:]))  # put back unsent
+                self._epoch += 1  # dropped first gram
+                raise  # unexpected error
+
+        if cnt:  # sent or dropped some
+            self._epoch += 1
+
+        if cnt < len(batch):  # put back unsent in order at front of .txgs
+            self.txgs.extendleft(reversed(batch[cnt:]))
+            if not dropped:
+                return False  # incomplete so try again later
+
+        return (False if self.txbs[1] else True)  # remainder in .txbs
+
     def serviceTxGramsOnce(self, *, echoic=False):
         """Service one pass (non-greedy) over all unique destinations in .txgs
         dict if any for blocked destination or unblocked with pending outgoing
-        grams.
+        grams. Also sends any remainder in .txbs when .txgs is empty.
 
         Parameters:
            echoic (bool): True means echo sends into receives via. echos
                            False measn do not echo
         """
-        if self.opened and self.txgs:
+        if self.opened and (self.txgs or self.txbs[1]):
             self._serviceOnceTxGrams(echoic=echoic)
 
 
@@ -1526,12 +1863,15 @@ class Memoer(hioing.Mixin):
         """Service multiple passes (greedy) over all unqique destinations in
         .txgs dict if any for blocked destinations or unblocked with pending
         outgoing grams until there is no unblocked destination with a pending gram.
+        Also sends any remainder in .txbs when .txgs is empty.
 
         Parameters:
            echoic (bool): True means echo sends into receives via. echos
                            False measn do not echo
         """
-        while self.opened and self.txgs:  # pending gram(s)
+        for _ in range(self.MaxServiceIters):  # bounded so cannot monopolize
+            if not (self.opened and (self.txgs or self.txbs[1])):  # nothing pending
+                break
             if not self._serviceOnceTxGrams(echoic=echoic):  # send incomplete
                 break  # try again later
 
@@ -1558,18 +1898,94 @@ class Memoer(hioing.Mixin):
         self.serviceTxGrams()
 
 
+    def _serviceAllRxFused(self, greedy=True):
+        """Service receive side of stack in one fused pass that calls the leaf
+        service methods directly with their guards inlined so each pass with
+        little work to do does not pay for the intermediate method calls.
+        Still calls .serviceRxMemos or .serviceRxMemosOnce so subclasses may
+        override them to handle received memos.
+
+        Parameters:
+            greedy (bool): True means same as .serviceAllRx
+                           False means same as .serviceAllRxOnce
+        """
+        if greedy:
+            for _ in range(self.MaxServiceIters):  # bounded so cannot monopolize
+                if not (self.opened and self._serviceManyReceived()):
+                    break
+        elif self.opened:
+            self._serviceOneReceived()
+
+        if self._rxDirty:  # fuse grams into memos when any may be complete
+            self._serviceOnceRxGrams()
+
+        if self.rxms:  # handle memos
+            if greedy:
+                self.serviceRxMemos()
+            else:
+                self.serviceRxMemosOnce()
+
+
+    def _serviceAllTxFused(self, greedy=True):
+        """Service transmit side of stack in one fused pass that calls the leaf
+        service methods directly with their guards inlined.
+        Also sends any remainder in .txbs when .txgs is empty.
+
+        Parameters:
+            greedy (bool): True means same as .serviceAllTx
+                           False means same as .serviceAllTxOnce
+        """
+        iters = self.MaxServiceIters if greedy else 1  # bounded
+
+        for _ in range(iters):  # rend memos into grams
+            if not self.txms:
+                break
+            self._serviceOneTxMemo()
+
+        for _ in range(iters):  # send grams
+            if not (self.opened and (self.txgs or self.txbs[1])):
+                break
+            if not self._serviceOnceTxGrams():  # send incomplete
+                break  # try again later
+
+
+    def _serviceAllFused(self, greedy=True):
+        """Service all Rx and Tx in one fused pass.
+        Override in subclass to service more between Rx and Tx.
+
+        Parameters:
+            greedy (bool): True means greedy as .serviceAll
+                           False means non-greedy as .serviceAllOnce
+        """
+        self._serviceAllRxFused(greedy)
+        self._serviceAllTxFused(greedy)
+
+
     def serviceAllOnce(self):
         """Service all Rx and Tx Once (non-greedy)
+
+        Returns:
+            progressed (bool): True means pass made progress so another pass
+                                   may make more
+                               False means pass made no progress
         """
-        self.serviceAllRxOnce()
-        self.serviceAllTxOnce()
+        epoch = self._epoch
+        self._serviceAllFused(greedy=False)
+        return self._epoch != epoch
 
 
     def serviceAll(self):
         """Service all Rx and Tx (greedy)
+        Same as .serviceAllRx followed by .serviceAllTx but fused.
+
+        Returns:
+            progressed (bool): True means pass made progress so another pass
+                                   may make more
+                               False means pass made no progress
         """
-        self.serviceAllRx()
-        self.serviceAllTx()
+        epoch = self._epoch
+        self._serviceAllFused(greedy=True)
+        return self._epoch != epoch
 
     service = serviceAll  # alias override peer service method
 
@@ -1609,13 +2025,23 @@ def openMemoer(cls=None, name="test", **kwa):
 
 class MemoerDoer(doing.Doer):
     """Memoer Doer for reliable transports that do not require retry tymers.
+    Base class of the transport specific memoer doers.
 
     See Doer for inherited attributes, properties, and methods.
 
-    Attributes:
+    Each .recur makes exactly one .peer.service pass, that is one greedy
+    .serviceAll. That pass is the one level that bounds the work of a recur
+    since each of its greedy loops is bounded by .peer.MaxServiceIters. So one
+    recur handles at most .MaxServiceIters receive batches and gram send
+    batches of .BatchSize grams each and .MaxServiceIters memo rends. Work
+    left over by those bounds waits for the next recur so other doers get
+    their turn in between.
+
+    Properties:
        .peer (Memoer): underlying transport instance subclass of Memoer
 
     """
+    __slots__ = ("_peer", "_service", "_reopen", "_close")  # hot path attrs as slots
 
     def __init__(self, peer, **kwa):
         """Initialize instance.
@@ -1627,19 +2053,40 @@ class MemoerDoer(doing.Doer):
         self.peer = peer
 
 
+    @property
+    def peer(self):
+        """
+        peer property getter, get ._peer
+        .peer is underlying transport instance
+        """
+        return self._peer
+
+
+    @peer.setter
+    def peer(self, peer):
+        """
+        set ._peer to peer and bind its .service, .reopen, and .close once
+        so .recur, .enter, and .exit skip attribute lookups on every call
+        """
+        self._peer = peer
+        self._service = peer.service
+        self._reopen = peer.reopen
+        self._close = peer.close
+
+
     def enter(self):
         """"""
-        self.peer.reopen()
+        self._reopen()
 
 
     def recur(self, tyme):
-        """"""
-        self.peer.service()
+        """Service .peer with one bounded greedy pass"""
+        self._service()
 
 
     def exit(self):
         """"""
-        self.peer.close()
+        self._close()
 
 
 
@@ -1684,15 +2131,18 @@ class TymeeMemoer(tyming.Tymee, Memoer):
         """
         Inject new tymist.tymth as new ._tymth. Changes tymist.tyme base.
         Updates winds .tymer .tymth
+
+        Only called when the tymist changes, not per recur, so wind any retry
+        tymers here explicitly by name as plain straight line code.
         """
-        super(TymeeMemoer, self).wind(tymth)
+        super().wind(tymth)  # zero-arg form skips global class lookup
         #self.tymer.wind(tymth)
 
     def serviceTymers(self):
         """Service all retry tymers
 
         Must be overriden in subclass.
-        This is a stub.
+        This is a stub. See module ToDo for the intended deadline heap.
         """
         pass
 
@@ -1704,20 +2154,17 @@ class TymeeMemoer(tyming.Tymee, Memoer):
         self.serviceTxGrams()
 
 
-    def serviceAllOnce(self):
-        """Service all Rx and Tx Once (non-greedy)
-        """
-        self.serviceAllRxOnce()
-        self.serviceTymers()
-        self.serviceAllTxOnce()
-
+    def _serviceAllFused(self, greedy=True):
+        """Service all Rx, retry tymers, and Tx in one fused pass.
+        Inherited .serviceAll and .serviceAllOnce call this.
 
-    def serviceAll(self):
-        """Service all Rx and Tx (greedy)
+        Parameters:
+            greedy (bool): True means greedy as .serviceAll
+                           False means non-greedy as .serviceAllOnce
         """
-        self.serviceAllRx()
+        self._serviceAllRxFused(greedy)
         self.serviceTymers()
-        self.serviceAllTx()
+        self._serviceAllTxFused(greedy)
 
 
 @contextmanager
@@ -1753,15 +2200,16 @@ def openTM(cls=None, name="test", **kwa):
             peer.close()
 
 
-class TymeeMemoerDoer(doing.Doer):
+class TymeeMemoerDoer(MemoerDoer):
     """TymeeMemoer Doer for unreliable transports that require retry tymers.
 
-    See Doer for inherited attributes, properties, and methods.
+    See MemoerDoer for inherited attributes, properties, and methods.
 
-    Attributes:
+    Properties:
        .peer (TymeeMemoer) is underlying transport instance subclass of TymeeMemoer
 
     """
+    __slots__ = ()
 
     def __init__(self, peer, **kwa):
         """Initialize instance.
@@ -1769,8 +2217,7 @@ class TymeeMemoerDoer(doing.Doer):
         Parameters:
            peer (TymeeMemoer):  subclass instance
         """
-        super(TymeeMemoerDoer, self).__init__(**kwa)
-        self.peer = peer
+        super(TymeeMemoerDoer, self).__init__(peer=peer, **kwa)
         if self.tymth:
             self.peer.wind(self.tymth)
 
@@ -1779,21 +2226,5 @@ class TymeeMemoerDoer(doing.Doer):
         """Inject new tymist.tymth as new ._tymth. Changes tymist.tyme base.
         Updates winds .tymer .tymth
         """
-        super(TymeeMemoerDoer, self).wind(tymth)
+        super().wind(tymth)  # zero-arg form skips global class lookup
         self.peer.wind(tymth)
-
-
-    def enter(self):
-        """"""
-        self.peer.reopen()
-
-
-    def recur(self, tyme):
-        """"""
-        self.peer.service()
-
-
-    def exit(self):
-        """"""
-        self.peer.close()
-
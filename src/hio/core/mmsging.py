@@ -0,0 +1,759 @@
+# -*- encoding: utf-8 -*-
+"""
+hio.core.mmsging Module
+
+ctypes bindings for the Linux sendmmsg(2) and recvmmsg(2) batch datagram system
+calls. These send or receive many datagrams with one system call instead of
+one sendto or recvfrom system call per datagram.
+
+https://man7.org/linux/man-pages/man2/sendmmsg.2.html
+https://man7.org/linux/man-pages/man2/recvmmsg.2.html
+
+Only available when libc provides sendmmsg and recvmmsg, i.e. Linux.
+Check .MMSG_SUPPORTED before use and otherwise fall back to per datagram calls.
+Use MMsgs to preallocate and reuse the ctypes arrays for each batch.
+Use MMsgMixin to give a datagram transport Memoer batched .sendMany and
+.receiveMany on top of them.
+
+Also constants for UDP generic segmentation offload (GSO) where one sendmsg
+with a UDP_SEGMENT control message sends a run of equal size datagrams.
+
+struct iovec {
+    void  *iov_base;    /* Starting address */
+    size_t iov_len;     /* Number of bytes to transfer */
+};
+
+struct msghdr {
+    void         *msg_name;       /* Optional address */
+    socklen_t     msg_namelen;    /* Size of address */
+    struct iovec *msg_iov;        /* Scatter/gather array */
+    size_t        msg_iovlen;     /* # elements in msg_iov */
+    void         *msg_control;    /* Ancillary data, see below */
+    size_t        msg_controllen; /* Ancillary data buffer len */
+    int           msg_flags;      /* Flags on received message */
+};
+
+struct mmsghdr {
+    struct msghdr msg_hdr;  /* Message header */
+    unsigned int  msg_len;  /* Number of bytes transmitted */
+};
+
+struct sockaddr_in {
+    sa_family_t    sin_family; /* address family: AF_INET */
+    in_port_t      sin_port;   /* port in network byte order */
+    struct in_addr sin_addr;   /* internet address */
+    char           sin_zero[8];
+};
+
+struct sockaddr_un {
+    sa_family_t sun_family;    /* AF_UNIX */
+    char        sun_path[108]; /* Pathname */
+};
+"""
+import sys
+import os
+import errno
+import select
+import socket
+import ctypes
+import ctypes.util
+
+from .. import help
+from .. import hioing
+
+logger = help.ogler.getLogger()
+
+
+class IOVec(ctypes.Structure):
+    """ctypes struct iovec"""
+    _fields_ = [("iov_base", ctypes.c_void_p),
+                ("iov_len", ctypes.c_size_t)]
+
+
+class MsgHdr(ctypes.Structure):
+    """ctypes struct msghdr"""
+    _fields_ = [("msg_name", ctypes.c_void_p),
+                ("msg_namelen", ctypes.c_uint32),
+                ("msg_iov", ctypes.POINTER(IOVec)),
+                ("msg_iovlen", ctypes.c_size_t),
+                ("msg_control", ctypes.c_void_p),
+                ("msg_controllen", ctypes.c_size_t),
+                ("msg_flags", ctypes.c_int)]
+
+
+class MMsgHdr(ctypes.Structure):
+    """ctypes struct mmsghdr"""
+    _fields_ = [("msg_hdr", MsgHdr),
+                ("msg_len", ctypes.c_uint)]
+
+
+class SockAddrIn(ctypes.Structure):
+    """ctypes struct sockaddr_in with port and addr in network byte order"""
+    _fields_ = [("sin_family", ctypes.c_ushort),
+                ("sin_port", ctypes.c_ubyte * 2),
+                ("sin_addr", ctypes.c_ubyte * 4),
+                ("sin_zero", ctypes.c_ubyte * 8)]
+
+
+class SockAddrUn(ctypes.Structure):
+    """ctypes struct sockaddr_un with nul terminated file system path"""
+    _fields_ = [("sun_family", ctypes.c_ushort),
+                ("sun_path", ctypes.c_char * 108)]
+
+
+def _loadLibc():
+    """Returns libc CDLL with errno support or None when not available"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    except OSError:
+        return None
+
+
+_libc = _loadLibc()
+_sendmmsg = getattr(_libc, "sendmmsg", None)
+_recvmmsg = getattr(_libc, "recvmmsg", None)
+
+if _sendmmsg is not None:
+    _sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(MMsgHdr),
+                          ctypes.c_uint, ctypes.c_int]
+    _sendmmsg.restype = ctypes.c_int
+
+if _recvmmsg is not None:
+    _recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(MMsgHdr),
+                          ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+    _recvmmsg.restype = ctypes.c_int
+
+MMSG_SUPPORTED = _sendmmsg is not None and _recvmmsg is not None
+
+# UDP generic segmentation offload (GSO) Linux 4.18+
+# https://man7.org/linux/man-pages/man7/udp.7.html
+UDP_SEGMENT = getattr(socket, "UDP_SEGMENT", 103)  # SOL_UDP cmsg type
+GSO_SUPPORTED = sys.platform.startswith("linux")
+GSO_MAX_SEGMENTS = 64  # kernel UDP_MAX_SEGMENTS max datagrams per gso send
+GSO_MAX_SIZE = 65507  # max total payload of gso send, max ipv4 udp payload
+
+
+def sockaddrIn(ha, sa=None):
+    """Encode host address ha into sockaddr_in struct
+
+    Returns:
+        sa (SockAddrIn): encoded ha
+
+    Parameters:
+        ha (tuple): host address duple of form (host: str, port: int) where
+                    host is dotted ipv4 address or resolvable host name
+        sa (SockAddrIn | None): existing struct to encode into or None for new
+    """
+    host, port = ha
+    sa = sa if sa is not None else SockAddrIn()
+    sa.sin_family = socket.AF_INET
+    ctypes.memmove(sa.sin_port, port.to_bytes(2, "big"), 2)
+    host = host if host else "0.0.0.0"
+    try:
+        addr = socket.inet_aton(host)
+    except OSError:  # not dotted ipv4 so resolve name
+        addr = socket.inet_aton(socket.gethostbyname(host))
+    ctypes.memmove(sa.sin_addr, addr, 4)
+    return sa
+
+
+def haFromSockaddrIn(sa):
+    """Decode sockaddr_in struct sa into host address duple
+
+    Returns:
+        ha (tuple): of form (host: str, port: int)
+
+    Parameters:
+        sa (SockAddrIn): encoded host address
+    """
+    return (socket.inet_ntoa(bytes(sa.sin_addr)), int.from_bytes(bytes(sa.sin_port), "big"))
+
+
+def haFromName(name):
+    """Decode sockaddr_in bytes name, as copied out of a receive slot by
+    MMsgs.unpack, into host address duple
+
+    Returns:
+        ha (tuple): of form (host: str, port: int)
+
+    Parameters:
+        name (bytes): encoded host address
+    """
+    return (socket.inet_ntoa(name[4:8]), int.from_bytes(name[2:4], "big"))
+
+
+def sockaddrUn(path, sa=None):
+    """Encode uxd file system path into sockaddr_un struct
+
+    Returns:
+        sa (SockAddrUn): encoded path
+
+    Parameters:
+        path (str): uxd file system path of at most 107 bytes when encoded
+        sa (SockAddrUn | None): existing struct to encode into or None for new
+
+    Raises OSError ENAMETOOLONG when encoded path too long to fit with nul
+    terminator, same exception class as socket.sendto raises
+    """
+    sa = sa if sa is not None else SockAddrUn()
+    raw = os.fsencode(path)
+    if len(raw) >= SockAddrUn.sun_path.size:
+        raise OSError(errno.ENAMETOOLONG, f"UXD path too long {path}.")
+    sa.sun_family = socket.AF_UNIX
+    sa.sun_path = raw  # ctypes nul terminates
+    return sa
+
+
+def pathFromSockaddrUn(sa, namelen):
+    """Decode sockaddr_un struct sa into uxd file system path
+
+    Returns:
+        path (str | None): uxd path or None when source socket is unnamed
+
+    Parameters:
+        sa (SockAddrUn): encoded path
+        namelen (int): size of sa filled in by kernel as .msg_namelen
+    """
+    if namelen <= SockAddrUn.sun_path.offset:  # unnamed so no path
+        return None
+    return os.fsdecode(sa.sun_path)  # .value up to nul terminator
+
+
+def pathFromName(name):
+    """Decode sockaddr_un bytes name, as copied out of a receive slot by
+    MMsgs.unpack, into uxd file system path
+
+    Returns:
+        path (str | None): uxd path or None when source socket is unnamed
+
+    Parameters:
+        name (bytes): encoded path of .msg_namelen bytes
+    """
+    offset = SockAddrUn.sun_path.offset
+    if len(name) <= offset:  # unnamed so no path
+        return None
+    return os.fsdecode(name[offset:].split(b"\0", 1)[0])  # up to nul terminator
+
+
+def sendmmsg(fd, msgs, n, flags=0):
+    """Send first n messages in msgs on socket fd with one system call
+
+    Returns:
+        cnt (int): number of messages sent. May be less than n.
+
+    Parameters:
+        fd (int): socket file descriptor
+        msgs (Array[MMsgHdr]): ctypes array of mmsghdr
+        n (int): number of messages from front of msgs to send
+        flags (int): send flags
+
+    Raises OSError when first message could not be sent
+    """
+    cnt = _sendmmsg(fd, msgs, n, flags)
+    if cnt < 0:
+        eno = ctypes.get_errno()
+        raise OSError(eno, os.strerror(eno))
+    return cnt
+
+
+
+def recvmmsg(fd, msgs, n, flags=0):
+    """Receive up to n messages into msgs from socket fd with one system call
+
+    Returns:
+        cnt (int): number of messages received. .msg_len of each holds its size
+
+    Parameters:
+        fd (int): socket file descriptor
+        msgs (Array[MMsgHdr]): ctypes array of mmsghdr
+        n (int): max number of messages to receive into front of msgs
+        flags (int): receive flags
+
+    Raises OSError such as EAGAIN when nothing to receive
+    """
+    cnt = _recvmmsg(fd, msgs, n, flags, None)
+    if cnt < 0:
+        eno = ctypes.get_errno()
+        raise OSError(eno, os.strerror(eno))
+    return cnt
+
+
+
+# flat word offsets into MMsgs views so hot paths index memoryviews instead of
+# building a ctypes struct object per field access
+_MSG_WORDS = ctypes.sizeof(MMsgHdr) // 4  # uint32 words per mmsghdr
+_MSG_LEN = MMsgHdr.msg_len.offset // 4  # word of .msg_len in mmsghdr
+_MSG_NAMELEN = MsgHdr.msg_namelen.offset // 4  # word of .msg_namelen in mmsghdr
+_MSG_FLAGS = MsgHdr.msg_flags.offset // 4  # word of .msg_flags in mmsghdr
+_MSG_TRUNC = int(socket.MSG_TRUNC)  # plain int since IntFlag & is slow
+
+
+class MMsgs:
+    """Reusable pool of linked ctypes arrays for batches of messages for
+    sendmmsg or recvmmsg. Each mmsghdr .msg_iov points at its own single iovec
+    and each mmsghdr .msg_name points at its own address struct of class .sa
+    such as SockAddrIn for udp or SockAddrUn for uxd.
+    When .bs then each iovec also points at its own .bs sized slot in one
+    contiguous .data buffer. Otherwise .pack lays out each batch of grams to
+    send back to back in a new .data. Arrays allocated once and reused for
+    every batch. Only reallocated by .fit when a larger batch is needed so the
+    hot path allocates no more than the one packed payload per send batch.
+    The hot paths read and write the kernel facing fields through flat
+    memoryviews of the arrays since each ctypes field access costs far more
+    than the system call saves per message.
+
+    Attributes:
+        size (int): number of messages in arrays
+        bs (int): size of each message data slot in .data. 0 means no .data
+        sa (type): ctypes address struct class of each entry in .addrs
+        msgs (Array[MMsgHdr]): mmsghdr for each message
+        iovs (Array[IOVec]): iovec for each message
+        addrs (Array[SockAddrIn | SockAddrUn]): address for each message
+        dsts (list): dst last encoded into each entry of .addrs so a send
+            only encodes an address when its slot holds a different dst.
+            None when slot not yet addressed.
+        data (Array[c_char] | bytearray): contiguous data buffer of
+            .size * .bs bytes or when no .bs then the joined grams of the
+            last .pack
+        truncated (int): count of messages skipped by last .unpack since
+            bigger than their .bs slot
+    """
+
+    def __init__(self, size=0, bs=0, sa=SockAddrIn):
+        """Initialize instance
+
+        Parameters:
+            size (int): number of messages in arrays
+            bs (int): size of each message data slot. 0 means no data buffer
+            sa (type): ctypes address struct class for each message
+        """
+        self.bs = bs
+        self.sa = sa
+        self.size = 0
+        self.truncated = 0
+        self.fit(size)
+
+
+    def fit(self, size):
+        """Reallocate arrays to hold size messages when current arrays are
+        too small. Otherwise reuse current arrays.
+
+        Parameters:
+            size (int): number of messages needed
+        """
+        if size <= self.size and self.size:  # big enough so reuse
+            return
+
+        self.size = size
+        self.msgs = (MMsgHdr * size)()
+        self.iovs = (IOVec * size)()
+        self.addrs = (self.sa * size)()
+        self.dsts = [None] * size
+        self.data = (ctypes.c_char * (size * self.bs))()
+        base = ctypes.addressof(self.data)
+        for i in range(size):
+            hdr = self.msgs[i].msg_hdr
+            hdr.msg_name = ctypes.addressof(self.addrs[i])
+            hdr.msg_namelen = ctypes.sizeof(self.sa)
+            hdr.msg_iov = ctypes.pointer(self.iovs[i])
+            hdr.msg_iovlen = 1
+            if self.bs:  # point iovec at own data slot
+                self.iovs[i].iov_base = base + i * self.bs
+                self.iovs[i].iov_len = self.bs
+        self._view = memoryview(self.data).cast("B")  # bytewise view of .data
+        self._words = memoryview(self.msgs).cast("B").cast("I")  # uint32 view
+        self._iovWords = memoryview(self.iovs).cast("B").cast("N")  # size_t view
+        self._addrView = memoryview(self.addrs).cast("B")  # bytewise view
+
+
+    def pack(self, grams):
+        """Join grams back to back into one new contiguous .data buffer and
+        point the iovec of each message at its gram so a whole batch is laid
+        out in one linear buffer instead of one buffer object per gram. Each
+        gram is copied once, by the join, and never again since the iovecs
+        point straight into the joined buffer. .data holds it so it stays
+        valid until the next .pack, that is, until after the send completes.
+        Only for pools without .bs slots, that is, send pools.
+
+        Parameters:
+            grams (list[bytes | bytearray | memoryview]): grams to send
+                in order. At most .size grams.
+        """
+        self.data = payload = bytearray().join(grams)  # only copy of grams
+        offset = ctypes.addressof(ctypes.c_char.from_buffer(payload)) if payload else 0
+
+        iovWords = self._iovWords  # iov_base, iov_len pair per message
+        j = 0
+        for gram in grams:
+            size = len(gram)
+            iovWords[j] = offset
+            iovWords[j + 1] = size
+            offset += size
+            j += 2
+
+
+    def unpack(self, cnt):
+        """Returns copies of the first cnt messages filled by recvmmsg so the
+        slots may be reused by the next recvmmsg while the caller owns the
+        copies. Skips any message the kernel truncated to fit its slot and
+        counts it in .truncated. Also skips any zero length message since an
+        empty datagram carries no gram. Then resets the slots with .reset.
+
+        Returns:
+            msgs (list[tuple]): duples of form (gram: bytearray, name: bytes)
+                where gram is copy of data received into slot, handed over
+                so never copied again, and name is copy of the .msg_namelen
+                bytes of source address the kernel wrote into slot. Use name
+                as key to cache the decoded source address.
+
+        Parameters:
+            cnt (int): number of messages filled by previous recvmmsg
+        """
+        view, addrView, words = self._view, self._addrView, self._words
+        bs, sal = self.bs, ctypes.sizeof(self.sa)
+        msgs = []
+        truncated = start = w = a = 0
+        for _ in range(cnt):
+            size = words[w + _MSG_LEN]
+            if words[w + _MSG_FLAGS] & _MSG_TRUNC:  # bigger than slot
+                truncated += 1
+            elif size:  # empty datagram has no gram so nothing received
+                msgs.append((bytearray(view[start:start + size]),
+                             addrView[a:a + words[w + _MSG_NAMELEN]].tobytes()))
+            start += bs
+            w += _MSG_WORDS
+            a += sal
+        self.truncated = truncated
+        self.reset(cnt)
+        return msgs
+
+
+    def reset(self, n):
+        """Reset in place the kernel written .msg_namelen of first n messages
+        so arrays may be reused for next recvmmsg. Only the n messages filled
+        by the previous recvmmsg need it so pass its count, not .size.
+        The kernel always writes .msg_len and .msg_flags of each message it
+        fills so those need no reset.
+
+        Parameters:
+            n (int): number of messages filled by previous recvmmsg
+        """
+        namelen, words = ctypes.sizeof(self.sa), self._words
+        for w in range(_MSG_NAMELEN, n * _MSG_WORDS, _MSG_WORDS):
+            words[w] = namelen
+
+
+
+class MMsgMixin(hioing.Mixin):
+    """Mixin that batches the datagram sends and receives of a Memoer socket
+    transport with sendmmsg and recvmmsg. Must precede both the transport Peer
+    and the Memoer in the mro, such as PeerMemoer(MMsgMixin, Peer, Memoer),
+    so that its .open, .close, .sendMany, and .receiveMany wrap theirs.
+
+    When libc provides sendmmsg and recvmmsg (Linux) then .sendMany sends
+    each batch of at least .MMsgMinBatch grams with one sendmmsg system call
+    instead of one sendto per gram and .receiveMany receives each batch of
+    grams with one recvmmsg system call instead of one recvfrom per gram.
+    Each recvmmsg slot holds ._rxSlotSize bytes. A datagram bigger than its
+    slot can not be a valid gram so is logged and dropped.
+
+    When epoll is supported (Linux) then the socket is registered edge
+    triggered (EPOLLET) on open. Once .receiveMany drains the socket it skips
+    recvmmsg until epoll reports a new arrival so an idle socket costs one
+    zero timeout epoll_wait per receive instead of building and making a
+    recvmmsg that can only fail with EAGAIN.
+
+    Subclass Hooks:
+        SockAddr (type): ctypes address struct class of the transport such as
+            SockAddrIn for udp or SockAddrUn for uxd
+        _encodeDst(dst): returns new SockAddr encoding of dst. Must be
+            overridden in subclass.
+        _decodeSrc(name): returns source address decoded from name bytes of
+            SockAddr. Must be overridden in subclass.
+        _rxSlotSize (int): bytes per recvmmsg slot. Default .MaxGramSize
+
+    Class Attributes:
+        SockAddr (type): ctypes address struct class of transport
+        DstCacheSize (int): max dst entries in ._dstCache before oldest evicted
+        SrcCacheSize (int): max src entries in ._srcCache before oldest evicted
+        MMsgMinBatch (int): min grams to send with one sendmmsg. Smaller
+            batches are sent with one sendto per gram which is faster below
+            about 8 grams
+
+    Hidden:
+        _txBatchBufs (MMsgs | None): reusable ctypes arrays for sendmmsg
+            lazily sized to largest batch sent. None when not yet needed or
+            sendmmsg not supported.
+        _rxBatchBufs (MMsgs | None): reusable ctypes arrays and contiguous
+            data buffer for recvmmsg lazily sized to .BatchSize grams of
+            ._rxSlotSize bytes. None when not yet needed or recvmmsg not
+            supported.
+        _dstCache (dict): encoded SockAddr for sendmmsg keyed by dst so each
+            dst is encoded only once. Oldest entry evicted first when
+            .DstCacheSize reached.
+        _srcCache (dict): decoded source address keyed by encoded SockAddr
+            bytes from recvmmsg so each src is decoded only once. Oldest entry
+            evicted first when .SrcCacheSize reached.
+        _epoll (select.epoll | None): edge triggered readiness of .ls while
+            opened. None when closed or epoll not supported.
+        _readable (bool): True means .ls may have grams to receive since not
+            drained since last epoll edge so recvmmsg without polling.
+            False means drained so poll ._epoll before next recvmmsg
+
+    """
+    SockAddr = SockAddrIn  # address struct class of transport
+    DstCacheSize = 1024  # max cached encoded dst addresses
+    SrcCacheSize = 1024  # max cached decoded src addresses
+    MMsgMinBatch = 8  # min grams per sendmmsg else one sendto per gram
+
+
+    def __init__(self, **kwa):
+        """Initialization method for instance.
+
+        See transport Peer and Memoer for keyword parameter passthroughs
+        """
+        self._epoll = None  # set before super since init may open
+        self._readable = True
+        super(MMsgMixin, self).__init__(**kwa)
+        self._txBatchBufs = None  # lazily sized on first sendMany
+        self._rxBatchBufs = None  # lazily sized on first receiveMany
+        self._dstCache = dict()  # encoded sockaddr keyed by dst
+        self._srcCache = dict()  # decoded src keyed by encoded sockaddr
+
+
+    @property
+    def _rxSlotSize(self):
+        """Bytes per recvmmsg slot. Default .MaxGramSize so any valid gram from
+        a remote peer fits whatever its own .size. Override in subclass.
+        """
+        return self.MaxGramSize
+
+
+    def _encodeDst(self, dst):
+        """Returns new .SockAddr encoding of dst.
+        Must be overridden in subclass.
+
+        Parameters:
+            dst (tuple | str): transport destination address
+        """
+        raise NotImplementedError
+
+
+    def _decodeSrc(self, name):
+        """Returns source address decoded from name.
+        Must be overridden in subclass.
+
+        Parameters:
+            name (bytes): encoded .SockAddr from MMsgs.unpack
+        """
+        raise NotImplementedError
+
+
+    def open(self):
+        """Opens socket in non blocking mode and when epoll supported registers
+        it edge triggered with new ._epoll
+
+        Returns:
+            result (bool): True means opened. False otherwise
+        """
+        if not super(MMsgMixin, self).open():
+            return False
+
+        self._readable = True  # nothing drained yet so receive first
+        if hasattr(select, "epoll"):
+            self._epoll = select.epoll()
+            self._epoll.register(self.ls.fileno(), select.EPOLLIN | select.EPOLLET)
+        return True
+
+
+    def close(self, **kwa):
+        """Closes ._epoll then socket.
+
+        Returns:
+            result (bool): True means closed successfully
+
+        See transport Peer for keyword parameter passthroughs
+        """
+        if self._epoll is not None:
+            self._epoll.close()
+            self._epoll = None
+        return super(MMsgMixin, self).close(**kwa)
+
+
+    def receiveMany(self, *, echoic=False):
+        """Perform non blocking receive of batch of grams on socket with one
+        recvmmsg system call. Falls back to one .receive per gram when recvmmsg
+        not supported or when echoic.
+
+        Returns:
+            grams (list[tuple]): duples of form (gram: bytearray, src) where
+                gram is a fresh bytearray handed over to the caller and src is
+                source address decoded by ._decodeSrc.
+                Empty when nothing to receive.
+
+        Parameters:
+            echoic (bool): True means use .echos in .receive debugging purposes
+                           False means do not use .echos
+        """
+        if echoic or not MMSG_SUPPORTED:
+            return super(MMsgMixin, self).receiveMany(echoic=echoic)
+
+        if not self._readable:  # drained so only receive after new edge
+            if self._epoll is not None and not self._epoll.poll(0):
+                return []  # no arrival since drained
+            self._readable = True
+
+        bs = self._rxSlotSize
+        if self._rxBatchBufs is None or self._rxBatchBufs.bs != bs:
+            self._rxBatchBufs = MMsgs(size=self.BatchSize, bs=bs, sa=self.SockAddr)
+        pool = self._rxBatchBufs
+        pool.fit(self.BatchSize)
+
+        try:
+            cnt = recvmmsg(self.ls.fileno(), pool.msgs, self.BatchSize,
+                           socket.MSG_DONTWAIT)
+        except OSError as ex:
+            # ex.args[0] == ex.errno for better compat
+            if (ex.args[0] in (errno.EAGAIN,
+                               errno.EWOULDBLOCK)):
+                self._readable = False  # drained so wait for next edge
+                return []  # receive has nothing
+            logger.error("Error receive on %s\n %s\n", self.name, ex)
+            raise
+
+        if cnt < self.BatchSize:  # short batch means drained
+            self._readable = False  # later arrivals raise new edge
+
+        grams = []
+        srcs = self._srcCache
+        msgs = pool.unpack(cnt)  # copies out of reused slots
+        if pool.truncated:  # bigger than slot so can not be valid grams
+            logger.error("Dropped %d grams bigger than %d bytes on %s\n",
+                         pool.truncated, pool.bs, self.name)
+        for gram, name in msgs:
+            if name in srcs:  # src may be None such as unnamed uxd source
+                src = srcs[name]
+            else:  # not yet decoded
+                src = self._src(name)
+            if self.wl:  # log over the wire receive
+                self.wl.writeRx(gram, who=src)
+            grams.append((gram, src))
+
+        return grams
+
+
+    def sendMany(self, batch, *, echoic=False):
+        """Perform non blocking send of batch of grams on socket with one
+        sendmmsg system call. Falls back to one .send per gram when sendmmsg
+        not supported, when echoic, or when batch has fewer than
+        .MMsgMinBatch grams.
+
+        Returns:
+            count (int): number of grams from front of batch completely sent.
+
+        Parameters:
+            batch (list[tuple]): duples of form (gram: bytes, dst) where dst
+                                 is transport destination address
+            echoic (bool): True means echo sends into receives via. echos
+                           False measn do not echo
+
+        Like sendmmsg, an error is only raised when the first gram in batch
+        fails. An error on a later gram stops the batch at that gram so that
+        the error is raised when the caller next tries to send it.
+        """
+        if echoic or not MMSG_SUPPORTED:
+            return super(MMsgMixin, self).sendMany(batch, echoic=echoic)
+        return self._sendMMsgs(batch)
+
+
+    def _sendMMsgs(self, batch):
+        """Send batch of grams with one sendmmsg system call. Falls back to
+        one .send per gram when sendmmsg not supported or when batch has
+        fewer than .MMsgMinBatch grams.
+
+        Returns:
+            count (int): number of grams from front of batch completely sent.
+
+        Parameters:
+            batch (list[tuple]): duples of form (gram: bytes, dst)
+        """
+        n = len(batch)
+        if not MMSG_SUPPORTED or n < self.MMsgMinBatch:
+            return super(MMsgMixin, self).sendMany(batch)
+
+        if self._txBatchBufs is None:
+            self._txBatchBufs = MMsgs(size=n, sa=self.SockAddr)
+        pool = self._txBatchBufs
+        pool.fit(n)  # only reallocates when outgrown
+        msgs, addrs, dsts = pool.msgs, pool.addrs, pool.dsts
+        try:
+            for i in range(n):  # bad dst such as unresolvable ends batch there
+                dst = batch[i][1]
+                if dsts[i] != dst:  # slot holds other dst so encode into it
+                    addrs[i] = self._sockaddr(dst)  # copies cached struct
+                    dsts[i] = dst
+        except OSError:  # socket.gaierror is OSError
+            if not i:  # report error when bad dst is first in batch
+                raise
+            n = i  # send up to bad dst so error raised when it is first
+        pool.pack([gram for gram, _ in batch[:n]])  # one contiguous payload buffer
+
+        try:
+            cnt = sendmmsg(self.ls.fileno(), msgs, n)
+        except OSError as ex:
+            # ex.args[0] == ex.errno for better compat
+            if (ex.args[0] in (errno.EAGAIN,
+                               errno.EWOULDBLOCK,
+                               errno.ENOBUFS,
+                               errno.ENOMEM)):
+                # not enough buffer space to send, do not consume data
+                return 0  # try again later with same data
+
+            logger.error("Error send from %s to %s.\n %s\n",
+                         self.name, batch[0][1], ex)
+            raise
+
+        if self.wl:  # log over the wire actually sent grams
+            for gram, dst in batch[:cnt]:
+                self.wl.writeTx(bytes(gram), who=dst)
+
+        return cnt
+
+
+    def _sockaddr(self, dst):
+        """Returns encoded .SockAddr for dst from ._dstCache. On miss encodes
+        dst once with ._encodeDst and caches it, evicting oldest entry when
+        cache is full.
+
+        Returns:
+            sa (SockAddrIn | SockAddrUn): encoded dst
+
+        Parameters:
+            dst (tuple | str): transport destination address
+        """
+        sa = self._dstCache.get(dst)
+        if sa is None:
+            sa = self._encodeDst(dst)
+            if len(self._dstCache) >= self.DstCacheSize:  # evict oldest
+                del self._dstCache[next(iter(self._dstCache))]
+            self._dstCache[dst] = sa
+        return sa
+
+
+    def _src(self, name):
+        """Returns source address decoded from name with ._decodeSrc and caches
+        it in ._srcCache, evicting oldest entry when cache is full.
+
+        Returns:
+            src (tuple | str | None): transport source address
+
+        Parameters:
+            name (bytes): encoded .SockAddr from MMsgs.unpack
+        """
+        src = self._decodeSrc(name)
+        if len(self._srcCache) >= self.SrcCacheSize:  # evict oldest
+            del self._srcCache[next(iter(self._srcCache))]
+        self._srcCache[name] = src
+        return src
@@ -0,0 +1,344 @@
+# -*- encoding: utf-8 -*-
+"""
+hio.core.udp.peermemoing Module
+
+ToDo:
+Add optional io_uring batch datapath for Linux as PeerMemoer subclass that
+overrides .sendMany and .receiveMany the same way the sendmmsg and recvmmsg
+versions do. Submit batch of IORING_OP_SENDMSG (or IORING_OP_SEND_ZC) sqes per
+.sendMany and keep multishot IORING_OP_RECVMSG sqes armed against registered
+buffers so .receiveMany only reaps cqes. With IORING_SETUP_SQPOLL the steady
+state service loop makes no system calls. Needs liburing bindings which are
+not a dependency so must stay optional with fallback to PeerMemoer.
+
+With io_uring, PeerMemoerDoer would become completion driven. .enter would
+set up the ring with a provided buffer ring for receives. .recur would submit
+and reap in one io_uring_enter bounded by the remaining tock, where the op
+kind is tagged in each sqe user_data. Then it would hand reaped receives to
+._serviceOneRxGram and retire reaped sends from .txgs.
+"""
+import errno
+import socket
+import struct
+from contextlib import contextmanager
+
+from ... import help
+from .. import mmsging
+from ..memo import TymeeMemoer, TymeeMemoerDoer
+from .udping import Peer, UDP_MAX_PACKET_SIZE
+
+logger = help.ogler.getLogger()
+
+
+class PeerMemoer(mmsging.MMsgMixin, Peer, TymeeMemoer):
+    """Class for sending memograms over UDP transport
+    Mixin base classes Peer and TymeeMemoer to attain memogram over udp transport.
+    Because UDP is unreliable uses TymeeMemoer for retry tymer support.
+    Mixin base class MMsgMixin batches sends and receives with sendmmsg and
+    recvmmsg and gates receives on edge triggered epoll readiness. Each
+    recvmmsg slot holds .bs bytes, the same as each .receive reads.
+
+    When GSO (UDP_SEGMENT) is supported (Linux) then .sendMany sends each run
+    of same size grams to the same dst, such as the grams rended from one
+    memo, with one sendmsg system call. The kernel segments the run back into
+    one datagram per gram so the receiver sees the same grams.
+
+
+    Inherited Class Attributes:
+        MaxGramSize (int): absolute max gram size on tx with overhead
+        BatchSize (int): max grams per batched send or receive
+        DstCacheSize (int): max dst entries in ._dstCache before oldest evicted
+        SrcCacheSize (int): max src entries in ._srcCache before oldest evicted
+        MMsgMinBatch (int): min grams to send with one sendmmsg
+        See mmsging.MMsgMixin Class
+        See memoing.TymeeMemoer Class
+        See Peer Class
+
+    Inherited Attributes:
+        See mmsging.MMsgMixin Class
+        See memoing.TymeeMemoer Class
+        See Peer Class
+
+    Class Attributes:
+        MaxGramSize (int): absolute max gram size on tx with overhead
+        SockAddr (type): SockAddrIn address struct class of udp
+
+    Methods:
+        service: alias of TymeeMemoer.serviceAll since Peer precedes
+            TymeeMemoer in the mro so its no-op Peer.service stub would
+            otherwise shadow the memo stack service that PeerMemoerDoer runs
+
+    Attributes:
+        gso (bool): True means send runs of same size grams to same dst with
+                        one GSO (UDP_SEGMENT) send each
+                    False means GSO not used either because not supported
+                        or disabled
+
+    Hidden:
+        _rxScratch (bytearray | None): reusable receive buffer of .bs bytes
+            for .receive. Lazily allocated on first .receive.
+        See mmsging.MMsgMixin Class
+
+    """
+    MaxGramSize = UDP_MAX_PACKET_SIZE  # 1024 assumes IPV6 capable equipment
+    SockAddr = mmsging.SockAddrIn  # udp address struct class
+    service = TymeeMemoer.serviceAll  # else Peer.service stub shadows it in mro
+
+
+    def __init__(self, *, bc=4, bufsize=None, gso=True, **kwa):
+        """Initialization method for instance.
+
+        Inherited Parameters:
+            bc (int | None): count of transport buffers of MaxGramSize
+            bufsize (int | None): socket buffer size. When None then
+                bufsize = bc * .MaxGramSize
+
+            See memoing.TymeeMemoer for other inherited paramters
+            See Peer for other inherited paramters
+
+
+        Parameters:
+            gso (bool): True means send runs of same size grams to same dst with
+                            GSO (UDP_SEGMENT) when supported
+                        False means do not use GSO
+
+        """
+        bufsize = bufsize if bufsize is not None else bc * self.MaxGramSize
+        super(PeerMemoer, self).__init__(bc=bc, bufsize=bufsize, **kwa)
+        self.gso = True if gso and mmsging.GSO_SUPPORTED else False
+        self._rxScratch = None  # lazily allocated on first receive
+
+
+    def receive(self, **kwa):
+        """Perform non blocking read on socket into reused scratch buffer.
+        Avoids allocating a fresh .bs sized buffer for each receive. Returns
+        data as bytearray copy handed over to caller so Memoer need not copy
+        it again before stripping its header.
+
+        Returns:
+            tuple of form (data, sa)
+            if no data then returns (b'',None)
+            but always returns a tuple with two elements
+        """
+        if self._rxScratch is None or len(self._rxScratch) != self.bs:
+            self._rxScratch = bytearray(self.bs)
+
+        try:
+            cnt, sa = self.ls.recvfrom_into(self._rxScratch, self.bs)
+        except OSError as ex:
+            # ex.args[0] == ex.errno for better compat
+            if (ex.args[0] in (errno.EAGAIN,
+                              errno.EWOULDBLOCK)):
+                return (b'', None) #receive has nothing empty string for data
+            else:
+                logger.error("Error receive on UDP %s\n %s\n", self.ha, ex)
+                raise #re raise exception ex
+
+        data = bytearray(memoryview(self._rxScratch)[:cnt])  # copy since reused
+        if self.wl:  # log over the wire receive
+            self.wl.writeRx(data, who=sa)
+
+        return (data, sa)
+
+
+    def sendMany(self, batch, *, echoic=False):
+        """Perform non blocking send of batch of grams on socket with as few
+        system calls as possible. Each run of consecutive same size grams to the
+        same dst is sent with one GSO (UDP_SEGMENT) sendmsg system call that the
+        kernel splits back into one datagram per gram. The other grams are sent
+        with one sendmmsg system call per span between runs.
+        Falls back to one .send per gram when neither is supported or when echoic.
+
+        Returns:
+            count (int): number of grams from front of batch completely sent.
+
+        Parameters:
+            batch (list[tuple]): duples of form (gram: bytes, dst: tuple) where
+                                 dst is udp destination addr duple of form
+                                 (host: str, port: int)
+            echoic (bool): True means echo sends into receives via. echos
+                           False measn do not echo
+
+        Like sendmmsg, an error is only raised when the first gram in batch
+        fails. An error on a later gram stops the batch at that gram so that
+        the error is raised when the caller next tries to send it.
+        """
+        if echoic or not (mmsging.MMSG_SUPPORTED or self.gso):
+            return super(PeerMemoer, self).sendMany(batch, echoic=echoic)
+
+        n = len(batch)
+        cnt = 0
+        while cnt < n:
+            run = self._gsoRun(batch, cnt) if self.gso else 1
+            if run > 1:  # send run with one gso send
+                end = cnt + run
+                send = self._sendGso
+            else:  # send up to start of next run with sendmmsg
+                end = cnt + 1
+                while end < n and not (self.gso and self._gsoRun(batch, end) > 1):
+                    end += 1
+                send = self._sendMMsgs
+
+            try:
+                sent = send(batch[cnt:end])
+            except OSError:
+                if cnt:  # report error on next call when gram is first in batch
+                    return cnt
+                raise
+
+            cnt += sent
+            if cnt < end or self.txbs[1]:  # incomplete so try again later
+                break
+
+        return cnt
+
+
+    def _gsoRun(self, batch, i):
+        """Returns length of run of grams in batch starting at i that may be
+        sent as one GSO send. Every gram in run has same dst and every gram
+        but the last has the same size as the first. The last may be shorter.
+
+        Parameters:
+            batch (list[tuple]): duples of form (gram: bytes, dst: tuple)
+            i (int): index of first gram in run
+        """
+        gram, dst = batch[i]
+        size = len(gram)
+        limit = min(mmsging.GSO_MAX_SEGMENTS, mmsging.GSO_MAX_SIZE // max(size, 1))
+        n = len(batch)
+        j = i + 1
+        while j < n and j - i < limit:
+            gram, d = batch[j]
+            if d != dst or len(gram) > size:
+                break
+            j += 1
+            if len(gram) < size:  # shorter gram may only end run
+                break
+        return j - i
+
+
+    def _sendGso(self, run):
+        """Send run of grams to same dst with one GSO (UDP_SEGMENT) sendmsg
+        system call. Kernel segments the data back into one datagram per gram.
+        When the socket does not support GSO then disables .gso and sends run
+        with ._sendMMsgs instead.
+
+        Returns:
+            count (int): number of grams sent. GSO sends all or none.
+
+        Parameters:
+            run (list[tuple]): duples of form (gram: bytes, dst: tuple) from
+                               ._gsoRun
+        """
+        dst = run[0][1]
+        size = len(run[0][0])
+        data = b"".join([gram for gram, _ in run])
+        try:
+            self.ls.sendmsg([data],
+                            [(socket.IPPROTO_UDP, mmsging.UDP_SEGMENT,
+                              struct.pack("=H", size))],
+                            0, dst)
+        except OSError as ex:
+            # ex.args[0] == ex.errno for better compat
+            if (ex.args[0] in (errno.EAGAIN,
+                               errno.EWOULDBLOCK,
+                               errno.ENOBUFS,
+                               errno.ENOMEM)):
+                # not enough buffer space to send, do not consume data
+                return 0  # try again later with same data
+
+            if (ex.args[0] in (errno.EINVAL,
+                               errno.EIO,
+                               errno.ENOPROTOOPT,
+                               errno.EOPNOTSUPP)):
+                # gso not supported on this socket or device so stop using it
+                logger.info("UDP GSO not supported on %s so disabled.\n %s\n",
+                            self.ha, ex)
+                self.gso = False
+                return self._sendMMsgs(run)
+
+            logger.error("Error send UDP from %s to %s.\n %s\n",
+                         self.ha, dst, ex)
+            raise
+
+        if self.wl:  # log over the wire actually sent grams
+            for gram, dst in run:
+                self.wl.writeTx(bytes(gram), who=dst)
+
+        return len(run)
+
+
+    @property
+    def _rxSlotSize(self):
+        """Bytes per recvmmsg slot. Same .bs as each .receive reads"""
+        return self.bs
+
+
+    def _encodeDst(self, dst):
+        """Returns new SockAddrIn encoding of dst
+
+        Parameters:
+            dst (tuple): udp destination addr duple of form (host: str, port: int)
+        """
+        return mmsging.sockaddrIn(dst)
+
+
+    def _decodeSrc(self, name):
+        """Returns udp source addr duple of form (host: str, port: int)
+
+        Parameters:
+            name (bytes): encoded sockaddr_in from MMsgs.unpack
+        """
+        return mmsging.haFromName(name)
+
+
+
+@contextmanager
+def openPM(cls=None, name="test", **kwa):
+    """
+    Wrapper to create and open UDP PeerMemoer instances
+    When used in with statement block, calls .close() on exit of with block
+
+    Parameters:
+        cls (Class): instance of subclass instance
+        name (str): unique identifer of PeerMemoer peer.
+                    Enables management of transport by name.
+
+    See udping.Peer and memoing.TymeeMemoer for other keyword parameter
+    passthroughs
+
+    Usage:
+        with openPM() as peer:
+            peer.receive()
+
+        with openPM(cls=PeerMemoerSubclass) as peer:
+            peer.receive()
+
+    """
+    peer = None
+    if cls is None:
+        cls = PeerMemoer
+    try:
+        peer = cls(name=name, **kwa)
+        peer.reopen()
+
+        yield peer
+
+    finally:
+        if peer:
+            peer.close()
+
+
+
+class PeerMemoerDoer(TymeeMemoerDoer):
+    """PeerMemoerDoer Doer for unreliable UDP transport.
+    Requires retry tymers.
+
+    See TymeeMemoerDoer for inherited attributes, properties, and methods.
+    To test in WingIde must configure Debug I/O to use external console
+
+    Properties:
+       .peer (PeerMemoer): underlying transport instance subclass of TymeeMemoer
+
+    """
+    __slots__ = ()
@@ -6,34 +6,54 @@ from contextlib import contextmanager
 
 from ... import help
 from ... import hioing
-from ...base import doing
 from ..uxd import Peer
-from ..memo import Memoer, GramDex
+from ..memo import Memoer, MemoerDoer, GramDex
+from .. import mmsging
 
 logger = help.ogler.getLogger()
 
 
-class PeerMemoer(Peer, Memoer):
+class PeerMemoer(mmsging.MMsgMixin, Peer, Memoer):
     """Class for sending memograms over UXD transport
     Mixin base classes Peer and Memoer to attain memogram over uxd transport.
+    Mixin base class MMsgMixin batches sends and receives with sendmmsg and
+    recvmmsg and gates receives on edge triggered epoll readiness.
+    Each recvmmsg slot holds .MaxGramSize bytes, the same as any gram the
+    remote peer may send whatever its own .size, so no valid gram is
+    truncated.
 
 
     Inherited Class Attributes:
         MaxGramSize (int): absolute max gram size on tx with overhead
+        BatchSize (int): max grams per batched send or receive
+        DstCacheSize (int): max dst entries in ._dstCache before oldest evicted
+        SrcCacheSize (int): max src entries in ._srcCache before oldest evicted
+        MMsgMinBatch (int): min grams to send with one sendmmsg
+        See mmsging.MMsgMixin Class
         See memoing.Memoer Class
         See Peer Class
 
     Inherited Attributes:
+        See mmsging.MMsgMixin Class
         See memoing.Memoer Class
         See Peer Class
 
     Class Attributes:
+        SockAddr (type): SockAddrUn address struct class of uxd
 
+    Methods:
+        service: alias of Memoer.serviceAll since Peer precedes Memoer in
+            the mro so its no-op Peer.service stub would otherwise shadow the
+            memo stack service that PeerMemoerDoer runs
 
     Attributes:
 
+    Hidden:
+        See mmsging.MMsgMixin Class
 
     """
+    SockAddr = mmsging.SockAddrUn  # uxd address struct class
+    service = Memoer.serviceAll  # else Peer.service stub shadows it in mro
 
 
     def __init__(self, *, bc=4, **kwa):
@@ -52,6 +72,24 @@ class PeerMemoer(Peer, Memoer):
         super(PeerMemoer, self).__init__(bc=bc, **kwa)
 
 
+    def _encodeDst(self, dst):
+        """Returns new SockAddrUn encoding of dst
+
+        Parameters:
+            dst (str): uxd destination path
+        """
+        return mmsging.sockaddrUn(dst)
+
+
+    def _decodeSrc(self, name):
+        """Returns uxd source path or None when source unnamed
+
+        Parameters:
+            name (bytes): encoded sockaddr_un from MMsgs.unpack
+        """
+        return mmsging.pathFromName(name)
+
+
 
 @contextmanager
 def openPM(cls=None, name="test", temp=True, reopen=True, clear=True,
@@ -103,39 +141,19 @@ def openPM(cls=None, name="test", temp=True, reopen=True, clear=True,
 
 
 
-class PeerMemoerDoer(doing.Doer):
+class PeerMemoerDoer(MemoerDoer):
     """PeerMemoerDoer Doer for reliable UXD transport.
     Does not require retry tymers.
 
-    See Doer for inherited attributes, properties, and methods.
+    See MemoerDoer for inherited attributes, properties, and methods.
     To test in WingIde must configure Debug I/O to use external console
 
-    Attributes:
-       .peer (PeerMemoerDoer): underlying transport instance subclass of Memoer
+    Properties:
+       .peer (PeerMemoer): underlying transport instance subclass of Memoer
 
     """
-
-    def __init__(self, peer, **kwa):
-        """Initialize instance.
-
-        Parameters:
-           peer (Peer): is Memoer Subclass instance
-        """
-        super(PeerMemoerDoer, self).__init__(**kwa)
-        self.peer = peer
-
-
-    def enter(self):
-        """"""
-        self.peer.reopen()
-
-
-    def recur(self, tyme):
-        """"""
-        self.peer.service()
-
+    __slots__ = ()
 
     def exit(self):
-        """"""
-        self.peer.close(clear=True)
-
+        """Close .peer and remove its uxd file"""
+        self._close(clear=True)
@@ -3,11 +3,15 @@
 tests.core.test_memoing module
 
 """
+import os
+import errno
+
 from base64 import urlsafe_b64encode as encodeB64
 from base64 import urlsafe_b64decode as decodeB64
 
 import pytest
 
+from hio import hioing
 from hio.help import helping
 from hio.base import doing, tyming
 from hio.core.memo import memoing
@@ -62,6 +66,29 @@ def test_memoer_class():
     """Done Test"""
 
 
+def test_b64_kernels():
+    """Test codec backed gram number and count conversions match helping"""
+    for i in (0, 1, 63, 64, 4095, 2**24-1):
+        assert memoing._intToB64b(i, l=4) == helping.intToB64b(i, l=4)
+        assert memoing._b64ToInt(helping.intToB64b(i, l=4)) == i
+        assert memoing._b64ToInt(bytearray(helping.intToB64b(i, l=4))) == i
+    assert memoing._intToB64b(2**24, l=4) == helping.intToB64b(2**24, l=4)  # overflow
+    assert memoing._intToB64b(5, l=3) == helping.intToB64b(5, l=3)  # unaligned
+    assert memoing._b64ToInt(b"AAF") == helping.b64ToInt(b"AAF")
+
+    with pytest.raises(hioing.MemoerError):
+        memoing._b64ToInt(b"AA*A")  # not base64
+    with pytest.raises(hioing.MemoerError):
+        memoing._b64ToInt(b"A*A")  # not base64 unaligned
+    for b in (b"AA+A", b"AA/A", b"AA==", bytearray(b"AA+A")):
+        with pytest.raises(hioing.MemoerError):
+            memoing._b64ToInt(b)  # standard alphabet or padding not url safe
+    assert memoing._b64ToInt(b"AA-A") == helping.b64ToInt(b"AA-A")
+    assert memoing._b64ToInt(b"AA_A") == helping.b64ToInt(b"AA_A")
+
+    """Done Test"""
+
+
 def test_memoer_basic():
     """Test Memoer class basic
     """
@@ -119,6 +146,21 @@ def test_memoer_basic():
     peer.serviceRxMemos()
     assert not peer.rxms
 
+    # invalid grams dropped without losing later valid gram in same batch
+    peer.echos.append(((mid[:-1] + '\xe9' + 'AAAA' + 'AAAB' + "Bad").encode(), "beta"))
+    peer.echos.append((b'_\xff' + b'A' * 40, "beta"))  # non ascii code
+    peer.echos.append((b'_Z' + b'A' * 40, "beta"))  # unknown code
+    peer.echos.append((gram, "beta"))
+    peer.serviceReceives(echoic=True)
+    assert not peer.echos
+    assert list(peer.rxgs.keys()) == [mid]
+    with pytest.raises(hioing.MemoerError):  # empty such as zero length datagram
+        peer.pick(bytearray())
+    assert not peer._serviceOneRxGram(bytearray(), "beta")  # dropped
+    assert peer.rxgs[mid][0] == bytearray(b'Hello There')
+    peer.serviceRxGrams()
+    assert peer.rxms.popleft() == ('Hello There', 'beta', None)
+
     # send and receive via echo
     memo = "See ya later!"
     dst = "beta"
@@ -356,6 +398,34 @@ def test_memoer_small_gram_size():
     peer.serviceRxMemos()
     assert not peer.rxms
 
+    # long memo rends into many grams and fuses back in order
+    memo = "".join(f"{i:03}" for i in range(200))
+    grams = peer.rend(memo)
+    bs = peer.size - 3 * peer.Sizes[peer.code].hs // 4  # curt body size
+    assert len(grams) == -(-(len(memo) + 3) // bs)  # ceil with curt neck of 3
+    for gram in grams:
+        assert len(gram) <= peer.size
+        peer.echos.append((gram, "beta"))
+    peer.serviceReceives(echoic=True)
+    peer.serviceRxGrams()
+    assert peer.rxms.popleft() == (memo, 'beta', None)
+
+    # memo that just fits in single gram takes single gram fast path
+    memo = "x" * (bs - 3)
+    grams = peer.rend(memo)
+    assert len(grams) == 1
+    assert len(grams[0]) == peer.size
+    assert len(peer.rend(memo + "x")) == 2
+    assert peer.rend("") == []  # empty memo has no grams
+    peer.memoit(memo, "beta")
+    peer.serviceTxMemos()
+    gram, dst = peer.txgs.popleft()
+    assert dst == "beta"
+    peer.echos.append((gram, "beta"))
+    peer.serviceReceives(echoic=True)
+    peer.serviceRxGrams()
+    assert peer.rxms.popleft() == (memo, 'beta', None)
+
     peer.close()
     assert peer.opened == False
     """ End Test """
@@ -706,6 +776,238 @@ def test_memoer_multiple_signed():
     """ End Test """
 
 
+def test_memoer_send_many():
+    """Test Memoer batched sends with .sendMany via ._serviceOnceTxGrams and
+    batched receives with .receiveMany
+    """
+    peer = memoing.Memoer(size=38)
+    assert peer.BatchSize == 64
+    peer.reopen()
+    assert peer.opened == True
+
+    # default sendMany sends whole batch
+    batch = [(b'abc', 'alpha'), (b'def', 'beta')]
+    assert peer.sendMany(batch, echoic=True) == 2
+    assert list(peer.echos) == batch
+    peer.echos.clear()
+
+    # more grams than fit in one batch
+    count = 2 * peer.BatchSize + 3
+    for i in range(count):
+        peer.gramit(f"gram {i}".encode(), "beta")
+    assert len(peer.txgs) == count
+    assert peer._serviceOnceTxGrams(echoic=True)  # one batch
+    assert len(peer.txgs) == count - peer.BatchSize
+    assert len(peer.echos) == peer.BatchSize
+    peer.serviceTxGrams(echoic=True)  # rest
+    assert not peer.txgs
+    assert peer.txbs == (b'', None)
+    assert len(peer.echos) == count
+    for i in range(count):  # sent in order
+        assert peer.echos[i] == (f"gram {i}".encode(), "beta")
+    peer.echos.clear()
+
+    # fuse pass reports whether any memo fused
+    assert not peer._serviceOnceRxGrams()
+    mid = '__ALBI68S1ZIxqwFOSWFF1L2'
+    peer.echos.append(((mid + 'AAAB' + "There").encode(), "beta"))  # second
+    peer.serviceReceives(echoic=True)
+    assert not peer._serviceOnceRxGrams()  # missing first gram
+    assert peer.rxgs[mid]
+    peer.echos.append(((mid + 'AAAA' + 'AAAC' + "Hello ").encode(), "beta"))  # first
+    peer.serviceReceives(echoic=True)
+    assert peer._serviceOnceRxGrams()
+    assert not peer.rxgs
+    assert not peer._rxDirty
+    assert peer.rxms.popleft() == ('Hello There', 'beta', None)
+
+    # only dirty mids are fused in fifo order while complete mids are removed
+    mida = '__ALBI68S1ZIxqwFOSWFF1L2'
+    midb = '__BLBI68S1ZIxqwFOSWFF1L2'
+    peer.echos.append(((mida + 'AAAA' + 'AAAC' + "Hello ").encode(), "beta"))
+    peer.echos.append(((midb + 'AAAA' + 'AAAC' + "Howdy ").encode(), "gamma"))
+    peer.serviceReceives(echoic=True)
+    assert list(peer._rxDirty) == [mida, midb]
+    assert not peer._serviceOnceRxGrams()
+    assert not peer._rxDirty  # incomplete so clean until next gram
+    peer.echos.append(((midb + 'AAAB' + "There").encode(), "gamma"))
+    peer.echos.append(((midb + 'AAAB' + "There").encode(), "gamma"))  # replay
+    peer.serviceReceives(echoic=True)
+    assert list(peer._rxDirty) == [midb]  # replay does not dirty again
+    assert peer._serviceOnceRxGrams()
+    assert not peer._rxDirty
+    assert list(peer.rxgs.keys()) == [mida]
+    assert peer.rxms.popleft() == ('Howdy There', 'gamma', None)
+    peer.echos.append(((mida + 'AAAB' + "There").encode(), "beta"))
+    peer.serviceReceives(echoic=True)
+    del peer.rxgs[mida]  # removed elsewhere so stale
+    assert not peer._serviceOnceRxGrams()
+    assert not peer._rxDirty
+    peer.counts.clear()
+    peer.sources.clear()
+    peer.vids.clear()
+
+    # complete memo with invalid utf-8 body dropped without losing later mids
+    peer.echos.append(((mida + 'AAAA' + 'AAAB').encode() + b"\xff\xfe", "beta"))
+    peer.echos.append(((midb + 'AAAA' + 'AAAB' + "Good").encode(), "gamma"))
+    peer.serviceReceives(echoic=True)
+    assert list(peer._rxDirty) == [mida, midb]
+    epoch = peer._epoch
+    assert peer._serviceOnceRxGrams()
+    assert peer._epoch > epoch
+    assert not peer._rxDirty
+    assert not peer.rxgs
+    assert not peer.counts
+    assert not peer.sources
+    assert not peer.vids
+    assert peer.rxms.popleft() == ('Good', 'gamma', None)
+    assert not peer.rxms
+
+    # default receiveMany receives up to BatchSize grams
+    for i in range(peer.BatchSize + 1):
+        peer.echos.append((f"gram {i}".encode(), "beta"))
+    grams = peer.receiveMany(echoic=True)
+    assert len(grams) == peer.BatchSize
+    assert grams[0] == (b'gram 0', "beta")
+    assert peer.receiveMany(echoic=True) == [(f"gram {peer.BatchSize}".encode(), "beta")]
+    assert peer.receiveMany(echoic=True) == []
+    assert peer.receiveMany() == []
+
+    # greedy service loops are bounded by MaxServiceIters per call
+    peer.MaxServiceIters = 1
+    for i in range(peer.BatchSize + 1):
+        peer.gramit(f"gram {i}".encode(), "beta")
+    peer.serviceTxGrams(echoic=True)  # one batch
+    assert len(peer.txgs) == 1
+    assert len(peer.echos) == peer.BatchSize
+    peer.serviceTxGrams(echoic=True)
+    assert not peer.txgs
+    peer.serviceReceives(echoic=True)  # one batch
+    assert len(peer.echos) == 1
+    peer.serviceReceives(echoic=True)
+    assert not peer.echos
+    peer.memoit("Hello", "beta")
+    peer.memoit("There", "beta")
+    peer.serviceTxMemos()  # one memo
+    assert len(peer.txms) == 1
+    peer.serviceTxMemos()
+    assert not peer.txms
+    peer.txgs.clear()
+    del peer.MaxServiceIters  # restore class default
+
+    class PartialMemoer(memoing.Memoer):
+        """Memoer whose send only sends .limit bytes then blocks"""
+        limit = 0
+
+        def send(self, txbs, dst, *, echoic=False):
+            cnt = min(len(txbs), self.limit)
+            self.limit -= cnt
+            return cnt
+
+    peer = PartialMemoer()
+    peer.reopen()
+    peer.gramit(b'abcdef', "alpha")
+    peer.gramit(b'ghi', "beta")
+    peer.gramit(b'jkl', "beta")
+    peer.limit = 8  # sends first gram and part of second
+    assert not peer._serviceOnceTxGrams()
+    assert peer.txbs == (b'i', "beta")  # remainder of second
+    assert isinstance(peer.txbs[0], memoryview)  # remainder not copied
+    assert list(peer.txgs) == [(b'jkl', "beta")]  # unsent put back
+    peer.limit = 0  # blocked
+    assert not peer._serviceOnceTxGrams()
+    assert peer.txbs == (b'i', "beta")
+    peer.limit = 4
+    peer.serviceTxGrams()
+    assert not peer.txgs
+    assert peer.txbs == (b'', None)
+    assert peer.limit == 0
+
+    peer.gramit(b'mnopqr', "gamma")
+    peer.limit = 2
+    assert not peer._serviceOnceTxGrams()
+    assert peer.txbs == (b'opqr', "gamma")
+    gram = peer.txbs[0]
+    peer.limit = 3
+    assert not peer._serviceOnceTxGrams()  # partial remainder again
+    assert peer.txbs == (b'r', "gamma")
+    assert peer.txbs[0].obj is gram.obj  # view onto same original gram
+    peer.limit = 1
+    assert peer._serviceOnceTxGrams()
+    assert peer.txbs == (b'', None)
+    assert peer.txbs is memoing._TXBS_IDLE  # view released with no alloc
+
+    # serviceTxGrams and serviceTxGramsOnce send pending .txbs when no .txgs
+    for service in (peer.serviceTxGrams, peer.serviceTxGramsOnce):
+        peer.gramit(b'stu', "gamma")
+        peer.limit = 1
+        assert not peer._serviceOnceTxGrams()
+        assert not peer.txgs
+        assert peer.txbs == (b'tu', "gamma")
+        peer.limit = 2
+        service()
+        assert peer.txbs == (b'', None)
+        assert peer.limit == 0
+
+    # fused serviceAll rends memos, sends grams, and sends remainder
+    peer.memoit("Hello There", "delta")
+    peer.limit = 4
+    peer.serviceAll()
+    assert not peer.txms
+    assert not peer.txgs
+    assert peer.txbs[1] == "delta"  # partial first gram
+    peer.limit = 1024
+    peer.serviceAll()  # sends remainder with .txgs empty
+    assert peer.txbs == (b'', None)
+    assert peer.limit == 1024 - (len("Hello There") + 32 - 4)
+
+    peer.close()
+
+    # unexpected send error drops only the failing gram
+    class BadDstMemoer(memoing.Memoer):
+        """Memoer whose send to "bad" raises EMSGSIZE"""
+        def send(self, txbs, dst, *, echoic=False):
+            if dst == "bad":
+                raise OSError(errno.EMSGSIZE, os.strerror(errno.EMSGSIZE))
+            return super().send(txbs, dst, echoic=echoic)
+
+    peer = BadDstMemoer()
+    peer.reopen()
+    peer.gramit(b'abc', "beta")
+    peer.gramit(b'def', "bad")
+    peer.gramit(b'ghi', "beta")
+    peer.serviceTxGrams(echoic=True)  # batch ends at bad gram
+    assert list(peer.txgs) == [(b'def', "bad"), (b'ghi', "beta")]
+    with pytest.raises(OSError):
+        peer.serviceTxGrams(echoic=True)  # raised once bad gram is first
+    assert list(peer.txgs) == [(b'ghi', "beta")]  # bad dropped rest put back
+    peer.serviceTxGrams(echoic=True)
+    assert not peer.txgs
+    assert list(peer.echos) == [(b'abc', "beta"), (b'ghi', "beta")]
+    peer.close()
+
+    class FailMemoer(memoing.Memoer):
+        """Memoer whose receive raises .eno"""
+        eno = errno.ECONNREFUSED
+
+        def receive(self, *, echoic=False):
+            raise OSError(self.eno, os.strerror(self.eno))
+
+    peer = FailMemoer()
+    peer.reopen()
+    peer.serviceReceives()  # droppable so nothing received
+    peer.serviceReceivesOnce()
+    assert not peer.rxgs
+    peer.eno = errno.EBADF  # unexpected so raises
+    with pytest.raises(OSError):
+        peer.serviceReceives()
+    with pytest.raises(OSError):
+        peer.serviceReceivesOnce()
+    peer.close()
+    assert peer.opened == False
+    """ End Test """
+
+
 def test_memoer_verific():
     """Test Memoer class with verific (signed required)
     """
@@ -761,6 +1063,31 @@ def test_memoer_verific():
 
     peer.close()
     assert peer.opened == False
+
+    # only signed grams are verified
+    class CountMemoer(memoing.Memoer):
+        """Memoer that counts verifications"""
+        verifies = 0
+
+        def verify(self, sig, ser, vid):
+            self.verifies += 1
+            return True
+
+    peer = CountMemoer()
+    gram = bytearray(('__ALBI68S1ZIxqwFOSWFF1L2' + 'AAAA' + 'AAAB' + "Hello There").encode())
+    assert peer.pick(gram) == ('__ALBI68S1ZIxqwFOSWFF1L2', None, 0, 1)
+    assert gram == b"Hello There"
+    assert peer.verifies == 0  # unsigned not verified
+    gram = bytearray((mid + vid + 'AAAA' + 'AAAB' + "Hello There" + sig).encode())
+    assert peer.pick(gram) == (mid, vid, 0, 1)
+    assert gram == b"Hello There"
+    assert peer.verifies == 1  # signed verified
+
+    # received bytearray gram is handed over and stripped in place
+    gram = bytearray(('__ALBI68S1ZIxqwFOSWFF1L2' + 'AAAA' + 'AAAB' + "Hello There").encode())
+    assert peer._serviceOneRxGram(gram, 'beta')
+    assert peer.rxgs['__ALBI68S1ZIxqwFOSWFF1L2'][0] is gram
+    assert gram == b"Hello There"
     """ End Test """
 
 
@@ -803,6 +1130,18 @@ def test_memoer_doer():
     assert doist.tyme == limit
     assert mgdoer.peer.opened == False
 
+    # peer methods bound once and rebound when peer reassigned
+    assert mgdoer._service == peer.service
+    assert mgdoer._reopen == peer.reopen
+    assert mgdoer._close == peer.close
+    other = memoing.Memoer()
+    mgdoer.peer = other
+    assert mgdoer.peer is other
+    assert mgdoer._service == other.service
+    assert mgdoer._service != peer.service
+    assert mgdoer._close == other.close
+    assert "_service" not in mgdoer.__dict__  # slot not instance dict
+
     """End Test """
 
 def test_tymee_memoer_basic():
@@ -944,6 +1283,30 @@ def test_tymee_memoer_basic():
 
     peer.close()
     assert peer.opened == False
+
+    # fused service passes service tymers between rx and tx
+    class CountTM(memoing.TymeeMemoer):
+        """TymeeMemoer that records service order"""
+        def __init__(self, **kwa):
+            super(CountTM, self).__init__(**kwa)
+            self.calls = []
+
+        def serviceTymers(self):
+            self.calls.append(("tymers", len(self.rxms), len(self.txms)))
+
+    peer = CountTM()
+    peer.reopen()
+    peer.memoit("Hello", "beta")
+    peer.service()  # alias of greedy serviceAll
+    assert peer.calls == [("tymers", 0, 1)]  # tymers before tx
+    assert not peer.txms
+    assert not peer.txgs  # stub send sends all
+    peer.memoit("There", "beta")
+    peer.memoit("Again", "beta")
+    peer.serviceAllOnce()  # non-greedy one memo
+    assert peer.calls[-1] == ("tymers", 0, 2)
+    assert len(peer.txms) == 1
+    peer.close()
     """ End Test """
 
 
@@ -995,17 +1358,84 @@ def test_tymee_memoer_doer():
     assert tmgdoer.tyme == tymist.tyme == 1.0
     assert peer.tyme == tymist.tyme == 1.0
 
+    # one recur is one serviceAll pass bounded by MaxServiceIters
+    peer.reopen()
+    peer.MaxServiceIters = 2  # two memo rends and two send batches per pass
+    for i in range(40):
+        peer.memoit(f"M{i}", "beta")
+    tmgdoer.recur(tyme=1.0)
+    assert len(peer.txms) == 40 - peer.MaxServiceIters
+    assert not peer.txgs  # rended grams sent
+    tmgdoer.recur(tyme=2.0)
+    assert len(peer.txms) == 40 - 2 * peer.MaxServiceIters
+    del peer.MaxServiceIters  # restore class default
+    tmgdoer.recur(tyme=3.0)
+    assert not peer.txms
+    peer.close()
+
+    # one recur receives at most MaxServiceIters batches of BatchSize grams
+    class FloodTM(memoing.TymeeMemoer):
+        """TymeeMemoer that always has another gram to receive"""
+        received = 0
+
+        def receive(self, *, echoic=False):
+            self.received += 1
+            return (b"x", "beta")  # invalid so dropped
+
+    peer = FloodTM()
+    doer = memoing.TymeeMemoerDoer(peer=peer)
+    peer.reopen()
+    peer.MaxServiceIters = 2
+    peer.BatchSize = 3
+    doer.recur(tyme=0.0)
+    assert peer.received == peer.MaxServiceIters * peer.BatchSize
+    peer.close()
+
+    # serviceAll reports whether its pass made progress
+    class BlockedTM(memoing.TymeeMemoer):
+        """TymeeMemoer whose send is always blocked"""
+        def __init__(self, **kwa):
+            super(BlockedTM, self).__init__(**kwa)
+            self.services = 0
+
+        def send(self, txbs, dst, *, echoic=False):
+            return 0  # blocked
+
+        def serviceTymers(self):
+            self.services += 1
+
+    peer = BlockedTM()
+    doer = memoing.TymeeMemoerDoer(peer=peer)
+    peer.reopen()
+    epoch = peer._epoch
+    peer.memoit("Hello", "beta")
+    assert peer._epoch == epoch + 1  # queued
+    doer.recur(tyme=0.0)
+    assert peer.services == 1  # one pass per recur
+    assert len(peer.txgs) == 1
+    epoch = peer._epoch
+    doer.recur(tyme=1.0)
+    assert peer.services == 2
+    assert peer._epoch == epoch  # still blocked
+    assert not peer.serviceAll()  # no progress
+    peer.send = lambda txbs, dst, *, echoic=False: len(txbs)  # unblocked
+    assert peer.serviceAll()  # progress
+    assert not peer.txgs
+    peer.close()
+
     """End Test """
 
 
 
 if __name__ == "__main__":
     test_memoer_class()
+    test_b64_kernels()
     test_memoer_basic()
     test_memoer_small_gram_size()
     test_memoer_multiple()
     test_memoer_basic_signed()
     test_memoer_multiple_signed()
+    test_memoer_send_many()
     test_memoer_verific()
     test_open_memoer()
     test_memoer_doer()
@@ -0,0 +1,80 @@
+# -*- encoding: utf-8 -*-
+"""
+tests.core.test_mmsging module
+
+"""
+import pytest
+
+from hio.core import mmsging
+
+
+def test_mmsging():
+    """Test mmsging sockaddr_in encoding and MMsgs pool"""
+    sa = mmsging.sockaddrIn(('127.0.0.1', 6101))
+    assert mmsging.haFromSockaddrIn(sa) == ('127.0.0.1', 6101)
+    sa = mmsging.sockaddrIn(('localhost', 256), sa)  # reuse struct
+    assert mmsging.haFromSockaddrIn(sa) == ('127.0.0.1', 256)
+
+    sa = mmsging.sockaddrUn("/tmp/hio_uxd_test/alpha.uxd")
+    namelen = mmsging.ctypes.sizeof(sa)
+    assert mmsging.pathFromSockaddrUn(sa, namelen) == "/tmp/hio_uxd_test/alpha.uxd"
+    assert mmsging.pathFromSockaddrUn(sa, 2) is None  # unnamed source
+    assert mmsging.pathFromName(bytes(sa)) == "/tmp/hio_uxd_test/alpha.uxd"
+    assert mmsging.pathFromName(bytes(sa)[:2]) is None  # unnamed source
+    with pytest.raises(OSError):
+        mmsging.sockaddrUn("/tmp/" + "a" * 108)  # too long
+
+    pool = mmsging.MMsgs(size=4)
+    assert pool.sa is mmsging.SockAddrIn
+    assert pool.size == 4
+    assert pool.bs == 0
+    assert len(pool.msgs) == len(pool.iovs) == len(pool.addrs) == 4
+    for i in range(4):
+        assert pool.msgs[i].msg_hdr.msg_iovlen == 1
+    msgs = pool.msgs
+    pool.fit(2)  # big enough so reused
+    assert pool.msgs is msgs
+    assert pool.size == 4
+    pool.fit(8)  # outgrown so reallocated
+    assert pool.msgs is not msgs
+    assert pool.size == 8
+
+    pool = mmsging.MMsgs(size=4, bs=16)  # with contiguous data buffer
+    assert len(pool.data) == 4 * 16
+    assert pool.iovs[1].iov_base - pool.iovs[0].iov_base == 16
+    assert pool.iovs[3].iov_len == 16
+    pool.data[16:21] = b"hello"
+    pool.msgs[1].msg_len = 5
+    mmsging.sockaddrIn(('127.0.0.1', 6101), pool.addrs[1])  # kernel written
+    msgs = pool.unpack(2)  # copies out first two slots
+    assert len(msgs) == 1  # empty first slot skipped since no gram
+    assert msgs[0] == (b"hello", bytes(pool.addrs[1]))
+    assert type(msgs[0][0]) is bytearray  # handed over so never copied again
+    assert mmsging.haFromName(msgs[0][1]) == ('127.0.0.1', 6101)
+    pool.msgs[0].msg_hdr.msg_namelen = 2  # kernel written
+    pool.msgs[1].msg_hdr.msg_namelen = 2
+    pool.reset(1)  # only first slot filled
+    assert pool.msgs[0].msg_hdr.msg_namelen == mmsging.ctypes.sizeof(mmsging.SockAddrIn)
+    assert pool.msgs[1].msg_hdr.msg_namelen == 2  # not filled so not reset
+
+    pool = mmsging.MMsgs(size=4)  # send pool packs grams back to back
+    pool.pack([b"abc", bytearray(b"de"), memoryview(b"xfgh")[1:]])
+    assert len(pool.data) == 8
+    assert [pool.iovs[i].iov_len for i in range(3)] == [3, 2, 3]
+    assert pool.iovs[1].iov_base - pool.iovs[0].iov_base == 3
+    assert pool.data == b"abcdefgh"
+    base = mmsging.ctypes.addressof(mmsging.ctypes.c_char.from_buffer(pool.data))
+    assert pool.iovs[0].iov_base == base  # iovecs point into joined grams
+    assert mmsging.ctypes.string_at(pool.iovs[2].iov_base, 3) == b"fgh"
+    pool.pack([b"x" * 6, b"y" * 6])  # each batch joined into its own buffer
+    assert pool.data == b"xxxxxxyyyyyy"
+    assert mmsging.ctypes.string_at(pool.iovs[1].iov_base, 6) == b"yyyyyy"
+
+    pool = mmsging.MMsgs(size=2, sa=mmsging.SockAddrUn)  # uxd addresses
+    assert pool.msgs[0].msg_hdr.msg_namelen == mmsging.ctypes.sizeof(mmsging.SockAddrUn)
+
+    """Done Test"""
+
+
+if __name__ == "__main__":
+    test_mmsging()
@@ -0,0 +1,367 @@
+# -*- encoding: utf-8 -*-
+"""
+tests.core.udp.test_peer_memoer module
+
+"""
+import errno
+import select
+import time
+
+import pytest
+
+from hio.base import doing, tyming
+from hio.core import wiring, mmsging
+from hio.core.memo import GramDex
+from hio.core.udp import udping, peermemoing
+
+
+def test_memoer_peer_basic():
+    """Test MemoerPeer class"""
+    alpha = peermemoing.PeerMemoer(name="alpha", port=6101, size=38)
+    assert alpha.name == "alpha"
+    assert alpha.code == GramDex.Basic
+    assert not alpha.curt
+    # (code, mid, vid, sig, neck, head) part sizes
+    assert alpha.Sizes[alpha.code] == (2, 22, 0, 0, 4, 28)  # cs ms vs ss ns hs
+    assert alpha.size == 38
+    assert alpha.MaxGramSize == udping.UDP_MAX_PACKET_SIZE
+    assert alpha.bc == 4
+    assert alpha.bs == alpha.bc * alpha.MaxGramSize
+    assert alpha.tymeout == 0.0
+    assert not alpha.opened
+    assert alpha.reopen()
+    assert alpha.opened
+    assert alpha.ha == ('0.0.0.0', 6101)
+
+    beta = peermemoing.PeerMemoer(name="beta", port=6102, size=38)
+    assert beta.reopen()
+    assert beta.ha == ('0.0.0.0', 6102)
+
+    # alpha sends
+    alpha.memoit("Hello there.", ('127.0.0.1', beta.port))
+    alpha.memoit("How ya doing?", ('127.0.0.1', beta.port))
+    assert len(alpha.txms) == 2
+    alpha.serviceTxMemos()
+    assert not alpha.txms
+    assert len(alpha.txgs) == 4
+    for m, d in alpha.txgs:
+        assert not alpha.wiff(m)  # base64
+        assert d == ('127.0.0.1', beta.port)
+    alpha.serviceTxGrams()
+    assert not alpha.txgs
+    assert alpha.txbs == (b'', None)
+    time.sleep(0.05)
+
+    # beta receives
+    beta.serviceReceives()
+    assert len(beta.rxgs) == 2
+    assert len(beta.counts) == 2
+    assert len(beta.sources) == 2
+
+    mid = list(beta.rxgs.keys())[0]
+    assert beta.sources[mid] == ('127.0.0.1', alpha.port)
+    assert beta.counts[mid] == 2
+    assert beta.rxgs[mid][0] == bytearray(b'Hello ')
+    assert beta.rxgs[mid][1] == bytearray(b'there.')
+
+    beta.serviceRxGrams()
+    assert not beta.rxgs
+    assert len(beta.rxms) == 2
+    assert beta.rxms[0] == ('Hello there.', ('127.0.0.1', alpha.port), None)
+    assert beta.rxms[1] == ('How ya doing?', ('127.0.0.1', alpha.port), None)
+    beta.serviceRxMemos()
+    assert not beta.rxms
+
+    # beta receives batch directly
+    for i in range(3):
+        alpha.gramit(f"gram {i}".encode(), ('127.0.0.1', beta.port))
+    alpha.serviceTxGrams()
+    time.sleep(0.05)
+    grams = beta.receiveMany()
+    assert grams == [(f"gram {i}".encode(), ('127.0.0.1', alpha.port))
+                     for i in range(3)]
+    assert list(beta._srcCache.values()) == [('127.0.0.1', alpha.port)]  # decoded once
+    assert (beta._epoll is not None) == hasattr(select, "epoll")
+    assert not beta._readable  # short batch so drained
+    assert beta.receiveMany() == []  # no new edge so recvmmsg skipped
+    alpha.gramit(b"gram 3", ('127.0.0.1', beta.port))
+    alpha.gramit(b"gram 4", ('127.0.0.1', beta.port))
+    alpha.serviceTxGrams()
+    time.sleep(0.05)
+    assert beta.receiveMany() == [(b"gram 3", ('127.0.0.1', alpha.port)),
+                                  (b"gram 4", ('127.0.0.1', alpha.port))]  # new edge
+    assert not beta._readable
+
+    # beta receives single gram into reused scratch buffer
+    alpha.gramit(b"gram A", ('127.0.0.1', beta.port))
+    alpha.gramit(b"gram B", ('127.0.0.1', beta.port))
+    alpha.serviceTxGrams()
+    time.sleep(0.05)
+    assert beta.receive() == (b"gram A", ('127.0.0.1', alpha.port))
+    scratch = beta._rxScratch
+    assert len(scratch) == beta.bs
+    assert beta.receive() == (b"gram B", ('127.0.0.1', alpha.port))
+    assert beta._rxScratch is scratch
+    assert beta.receive() == (b'', None)
+
+    # runs of same size grams to same dst sent with gso
+    assert alpha.gso == mmsging.GSO_SUPPORTED
+    dst = ('127.0.0.1', beta.port)
+    batch = [(b"aaa", dst), (b"bbb", dst), (b"cc", dst), (b"ddd", dst),
+             (b"e", dst), (b"ff", dst), (b"ggg", ('127.0.0.1', 6103))]
+    assert alpha._gsoRun(batch, 0) == 3  # shorter gram ends run
+    assert alpha._gsoRun(batch, 3) == 2
+    assert alpha._gsoRun(batch, 4) == 1  # longer gram not in run
+    assert alpha._gsoRun(batch, 5) == 1  # different dst not in run
+    assert alpha._gsoRun([(b"x" * 2000, dst)] * 40, 0) == 32  # max size
+    assert alpha._gsoRun([(b"x", dst)] * 100, 0) == 64  # max segments
+    assert not alpha._dstCache  # only gso sends so far
+
+    # grams with no runs sent with one sendto each when too few for sendmmsg
+    for i in range(3):
+        alpha.gramit(b"g" * (i + 1), dst)  # increasing size so no runs
+    alpha.serviceTxGrams()
+    time.sleep(0.05)
+    assert beta.receiveMany() == [(b"g" * (i + 1), ('127.0.0.1', alpha.port))
+                                  for i in range(3)]
+    assert not alpha._txBatchBufs  # sendmmsg not used
+
+    # grams with no runs sent with sendmmsg
+    for i in range(alpha.MMsgMinBatch):
+        alpha.gramit(b"g" * (i + 1), dst)  # increasing size so no runs
+    alpha.serviceTxGrams()
+    time.sleep(0.05)
+    assert beta.receiveMany() == [(b"g" * (i + 1), ('127.0.0.1', alpha.port))
+                                  for i in range(alpha.MMsgMinBatch)]
+    assert alpha._txBatchBufs.dsts[:alpha.MMsgMinBatch] == [dst] * alpha.MMsgMinBatch
+
+    # encoded dst cached once per dst
+    assert list(alpha._dstCache.keys()) == [('127.0.0.1', beta.port)]
+    sa = alpha._dstCache[('127.0.0.1', beta.port)]
+    assert mmsging.haFromSockaddrIn(sa) == ('127.0.0.1', beta.port)
+    assert alpha._sockaddr(('127.0.0.1', beta.port)) is sa
+    alpha.DstCacheSize = 2
+    alpha._sockaddr(('127.0.0.1', 6103))
+    alpha._sockaddr(('127.0.0.1', 6104))  # evicts oldest
+    assert list(alpha._dstCache.keys()) == [('127.0.0.1', 6103), ('127.0.0.1', 6104)]
+    del alpha.DstCacheSize  # restore class default
+    alpha._dstCache.clear()
+
+    # unresolvable dst ends sendmmsg batch at that gram then only it is dropped
+    alpha.MMsgMinBatch = 1  # sendmmsg even small batches
+    bad = ('256.256.256.256', beta.port)
+    alpha.gramit(b"g", dst)
+    alpha.gramit(b"gg", bad)
+    alpha.gramit(b"ggg", dst)
+    alpha.serviceTxGrams()  # sends first gram then stops at bad dst
+    assert list(alpha.txgs) == [(b"gg", bad), (b"ggg", dst)]
+    with pytest.raises(OSError):  # socket.gaierror
+        alpha.serviceTxGrams()
+    assert list(alpha.txgs) == [(b"ggg", dst)]
+    alpha.serviceTxGrams()
+    assert not alpha.txgs
+    time.sleep(0.05)
+    assert beta.receiveMany() == [(b"g", ('127.0.0.1', alpha.port)),
+                                  (b"ggg", ('127.0.0.1', alpha.port))]
+    del alpha.MMsgMinBatch  # restore class default
+    alpha._dstCache.clear()
+
+    # alpha sends more grams than fit in a single batch
+    count = 2 * alpha.BatchSize + 3
+    for i in range(count):
+        alpha.memoit(f"M{i:03}", ('127.0.0.1', beta.port))
+    alpha.serviceTxMemos()  # bounded by MaxServiceIters memos per call
+    assert len(alpha.txgs) == alpha.MaxServiceIters
+    assert len(alpha.txms) == count - alpha.MaxServiceIters
+    while alpha.txms:
+        alpha.serviceTxMemos()
+    assert len(alpha.txgs) == count
+    alpha.serviceTxGrams()
+    assert not alpha.txgs
+    assert alpha.txbs == (b'', None)
+    time.sleep(0.05)
+
+    beta.serviceReceives()
+    beta.serviceRxGrams()
+    assert len(beta.rxms) == count
+    for i in range(count):  # grams arrive in order sent
+        assert beta.rxms[i] == (f"M{i:03}", ('127.0.0.1', alpha.port), None)
+    beta.serviceRxMemos()
+    assert not beta.rxms
+
+    # long memo rends into runs of same size grams
+    memo = "".join(f"{i:03}" for i in range(300))
+    for gso in (mmsging.GSO_SUPPORTED, False):  # with and without gso
+        alpha.gso = gso
+        alpha.memoit(memo, ('127.0.0.1', beta.port))
+        alpha.serviceTxMemos()
+        assert len(alpha.txgs) > mmsging.GSO_MAX_SEGMENTS  # more than one run
+        alpha.serviceTxGrams()
+        assert not alpha.txgs
+        assert alpha.gso == gso  # not disabled by failed gso send
+        time.sleep(0.05)
+        beta.serviceReceives()
+        beta.serviceRxGrams()
+        assert beta.rxms.popleft() == (memo, ('127.0.0.1', alpha.port), None)
+    alpha.gso = mmsging.GSO_SUPPORTED
+
+    # empty datagram ahead of valid memo is skipped without losing the memo
+    alpha.ls.sendto(b"", ('127.0.0.1', beta.port))
+    alpha.memoit("After empty", ('127.0.0.1', beta.port))
+    alpha.serviceTxMemos()
+    alpha.serviceTxGrams()
+    time.sleep(0.05)
+    beta.serviceReceives()
+    beta.serviceRxGrams()
+    assert beta.rxms.popleft() == ("After empty", ('127.0.0.1', alpha.port), None)
+    assert not beta.rxgs
+
+    assert beta.close()
+    assert not beta.opened
+    assert beta._epoll is None
+    assert alpha.close()
+    assert not alpha.opened
+
+    """Done Test"""
+
+
+def test_memoer_peer_gso_fallback():
+    """Test PeerMemoer disables GSO and falls back to plain sends when the
+    socket does not support GSO
+    """
+    class NoGsoSocket:
+        """Socket wrapper whose sendmsg always fails with .eno"""
+        def __init__(self, ls, eno):
+            self.ls = ls
+            self.eno = eno
+            self.tries = 0
+
+        def sendmsg(self, *pa, **kwa):
+            self.tries += 1
+            raise OSError(self.eno, errno.errorcode[self.eno])
+
+        def __getattr__(self, name):
+            return getattr(self.ls, name)
+
+    with (peermemoing.openPM(name='alpha', port=6101, size=38) as alpha,
+          peermemoing.openPM(name='beta', port=6102, size=38) as beta):
+        dst = ('127.0.0.1', beta.port)
+        src = ('127.0.0.1', alpha.port)
+        memo = "".join(f"{i:03}" for i in range(60))
+        for eno in (errno.EINVAL, errno.EIO, errno.ENOPROTOOPT, errno.EOPNOTSUPP):
+            alpha.gso = True
+            alpha.memoit(memo, dst)
+            alpha.serviceTxMemos()
+            grams = [bytes(gram) for gram, _ in alpha.txgs]
+            assert alpha._gsoRun(list(alpha.txgs), 0) == len(grams)  # one run
+            ls = alpha.ls
+            alpha.ls = NoGsoSocket(ls, eno)
+            alpha.serviceTxGrams()
+            failer, alpha.ls = alpha.ls, ls
+            assert failer.tries == 1  # gso tried once then disabled
+            assert not alpha.gso
+            assert not alpha.txgs
+            assert alpha.txbs == (b'', None)
+            time.sleep(0.05)
+            assert beta.receiveMany() == [(gram, src) for gram in grams]  # in order
+
+    """Done Test"""
+
+
+def test_memoer_peer_wired():
+    """Test MemoerPeer batched sends with wire log"""
+    with (wiring.openWL(samed=True) as wl,
+          peermemoing.openPM(name='alpha', port=6101, size=38, wl=wl) as alpha,
+          peermemoing.openPM(name='beta', port=6102, size=38) as beta):
+
+        assert alpha.opened
+        assert beta.opened
+
+        alpha.memoit("Hello there.", ('127.0.0.1', beta.port))
+        alpha.serviceTxMemos()
+        grams = [g for g, d in alpha.txgs]
+        alpha.serviceTxGrams()
+        assert not alpha.txgs
+        for gram in grams:
+            assert gram in wl.readTx()
+
+        time.sleep(0.05)
+        beta.serviceAll()
+        assert not beta.rxgs
+        assert not beta.rxms
+
+    assert not alpha.opened
+    assert not beta.opened
+
+    """Done Test"""
+
+
+def test_peermemoer_doer():
+    """Test PeerMemoerDoer class
+    """
+    tock = 0.03125
+    ticks = 4
+    limit = ticks *  tock
+    doist = doing.Doist(tock=tock, real=True, limit=limit)
+    assert doist.tyme == 0.0  # on next cycle
+    assert doist.tock == tock == 0.03125
+    assert doist.real == True
+    assert doist.limit == limit == 0.125
+    assert doist.doers == []
+
+    peer = peermemoing.PeerMemoer(name="test", port=6101)
+    assert peer.opened == False
+
+    doer = peermemoing.PeerMemoerDoer(peer=peer)
+    assert doer.peer == peer
+    assert not doer.peer.opened
+    assert doer.tock == 0.0  # ASAP
+
+    doers = [doer]
+    doist.do(doers=doers)
+    assert doist.tyme == limit
+    assert peer.opened == False
+
+    tymist = tyming.Tymist(tock=1.0)
+    doer.wind(tymth=tymist.tymen())
+    assert doer.tyme == tymist.tyme == 0.0
+    assert peer.tyme == tymist.tyme == 0.0
+    tymist.tick()
+    assert doer.tyme == tymist.tyme == 1.0
+    assert peer.tyme == tymist.tyme == 1.0
+
+    # recur services memo stack of peer not the Peer.service stub
+    assert peermemoing.PeerMemoer.service is peermemoing.PeerMemoer.serviceAll
+
+    class CatchPeerMemoer(peermemoing.PeerMemoer):
+        """PeerMemoer that keeps each received memo in .caught"""
+        def serviceRxMemos(self):
+            while self.rxms:
+                self.caught.append(self.rxms.popleft())
+
+    with (peermemoing.openPM(name='alpha', port=6101, size=38) as alpha,
+          peermemoing.openPM(cls=CatchPeerMemoer, name='beta', port=6102,
+                             size=38) as beta):
+        beta.caught = []
+        alphaDoer = peermemoing.PeerMemoerDoer(peer=alpha)
+        betaDoer = peermemoing.PeerMemoerDoer(peer=beta)
+        assert betaDoer._service == beta.serviceAll
+        memo = "Hello there. " * 6  # multiple grams at size 38
+        alpha.memoit(memo, ('127.0.0.1', beta.port))
+        doist = doing.Doist(tock=tock, real=True, limit=limit)
+        doist.do(doers=[alphaDoer, betaDoer])
+        assert doist.tyme == limit
+        assert not alpha.txms
+        assert not alpha.txgs
+        assert beta.caught == [(memo, ('127.0.0.1', alpha.port), None)]
+        assert not beta.rxgs
+        assert not beta.service()  # nothing to do so no progress
+
+    """Done Test"""
+
+
+if __name__ == "__main__":
+    test_memoer_peer_basic()
+    test_memoer_peer_gso_fallback()
+    test_memoer_peer_wired()
+    test_peermemoer_doer()
@@ -4,6 +4,7 @@ tests.core.test_peer_memoer module
 
 """
 import os
+import select
 
 import pytest
 
@@ -128,6 +129,96 @@ def test_memoer_peer_basic():
     alpha.serviceRxMemos()
     assert not alpha.rxms
 
+    # beta receives batch directly
+    for i in range(3):
+        alpha.gramit(f"gram {i}".encode(), beta.path)
+    alpha.serviceTxGrams()
+    assert not alpha.txgs
+    assert not alpha._dstCache  # too few for sendmmsg so sent with sendto
+    grams = beta.receiveMany()
+    assert grams == [(f"gram {i}".encode(), alpha.path) for i in range(3)]
+    assert list(beta._srcCache.values()) == [alpha.path]  # decoded once
+    assert len(beta._rxBatchBufs.data) == beta.BatchSize * beta.MaxGramSize
+    assert (beta._epoll is not None) == hasattr(select, "epoll")
+    assert not beta._readable  # short batch so drained
+    assert beta.receiveMany() == []  # no new edge so recvmmsg skipped
+    count = alpha.MMsgMinBatch  # enough for sendmmsg
+    for i in range(count):
+        alpha.gramit(f"gram {i}".encode(), beta.path)
+    alpha.serviceTxGrams()
+    assert not alpha.txgs
+    assert list(alpha._dstCache.keys()) == [beta.path]  # encoded once
+    assert alpha._txBatchBufs.dsts[:count] == [beta.path] * count
+    grams = beta.receiveMany()
+    assert grams == [(f"gram {i}".encode(), alpha.path) for i in range(count)]
+
+    # too long dst path ends sendmmsg batch at that gram then only it is dropped
+    alpha.MMsgMinBatch = 1  # sendmmsg even small batches
+    bad = "/tmp/" + "a" * 108
+    alpha.gramit(b"g", beta.path)
+    alpha.gramit(b"gg", bad)
+    alpha.gramit(b"ggg", beta.path)
+    alpha.serviceTxGrams()  # sends first gram then stops at bad dst
+    assert list(alpha.txgs) == [(b"gg", bad), (b"ggg", beta.path)]
+    with pytest.raises(OSError):  # ENAMETOOLONG
+        alpha.serviceTxGrams()
+    assert list(alpha.txgs) == [(b"ggg", beta.path)]
+    alpha.serviceTxGrams()
+    assert not alpha.txgs
+    assert beta.receiveMany() == [(b"g", alpha.path), (b"ggg", alpha.path)]
+    del alpha.MMsgMinBatch  # restore class default
+    assert beta.receiveMany() == []
+
+    # grams bigger than receiver .size are not truncated
+    alpha.ls.sendto(b"x" * 100, beta.path)
+    alpha.ls.sendto(b"y" * 20, beta.path)
+    assert beta.receiveMany() == [(b"x" * 100, alpha.path), (b"y" * 20, alpha.path)]
+    assert beta._rxBatchBufs.bs == beta.MaxGramSize
+
+    # empty datagram ahead of valid memo is skipped without losing the memo
+    alpha.ls.sendto(b"", beta.path)
+    alpha.memoit("After empty", beta.path)
+    alpha.serviceTxMemos()
+    alpha.serviceTxGrams()
+    beta.serviceReceives()
+    beta.serviceRxGrams()
+    assert beta.rxms.popleft() == ("After empty", alpha.path, None)
+    assert not beta.rxgs
+
+    # peer with larger .size sends memos that all arrive at smaller .size peer
+    alpha.size = 200
+    memos = [f"{i:03}" * 80 for i in range(alpha.MMsgMinBatch)]
+    for memo in memos:
+        alpha.memoit(memo, beta.path)
+    while alpha.txms:
+        alpha.serviceTxMemos()
+    assert len(alpha.txgs) > alpha.MMsgMinBatch  # enough for sendmmsg
+    assert len(alpha.txgs[0][0]) == 200 > beta.size
+    while alpha.txgs:  # uxd receive queue is short so interleave receives
+        alpha.serviceTxGrams()
+        beta.serviceReceives()
+    beta.serviceRxGrams()
+    assert [memo for memo, _, _ in beta.rxms] == memos
+    beta.rxms.clear()
+    alpha.size = 38
+
+    # alpha sends more grams than fit in a single batch
+    count = 2 * alpha.BatchSize + 3
+    for i in range(count):
+        alpha.memoit(f"M{i:03}", beta.path)
+    while alpha.txms:
+        alpha.serviceTxMemos()
+    assert len(alpha.txgs) == count
+    while alpha.txgs:  # uxd receive queue is short so interleave receives
+        alpha.serviceTxGrams()
+        beta.serviceReceives()
+    beta.serviceRxGrams()
+    assert len(beta.rxms) == count
+    for i in range(count):  # grams arrive in order sent
+        assert beta.rxms[i] == (f"M{i:03}", alpha.path, None)
+    beta.serviceRxMemos()
+    assert not beta.rxms
+
 
     assert beta.close()
     assert not beta.opened
@@ -296,6 +387,34 @@ def test_peermemoer_doer():
     assert doist.tyme == limit
     assert peer.opened == False
     assert not os.path.exists(peer.path)
+
+    # recur services memo stack of peer not the Peer.service stub
+    assert peermemoing.PeerMemoer.service is peermemoing.PeerMemoer.serviceAll
+
+    class CatchPeerMemoer(peermemoing.PeerMemoer):
+        """PeerMemoer that keeps each received memo in .caught"""
+        def serviceRxMemos(self):
+            while self.rxms:
+                self.caught.append(self.rxms.popleft())
+
+    with (peermemoing.openPM(name='alpha', size=38) as alpha,
+          peermemoing.openPM(cls=CatchPeerMemoer, name='beta', size=38) as beta):
+        beta.caught = []
+        alphaDoer = peermemoing.PeerMemoerDoer(peer=alpha)
+        betaDoer = peermemoing.PeerMemoerDoer(peer=beta)
+        assert betaDoer._service == beta.serviceAll
+        doist = doing.Doist(tock=tock, doers=[alphaDoer, betaDoer])
+        doist.enter()  # reopen gives beta a new temp path so memoit after
+        memo = "Hello there. " * 6  # multiple grams at size 38
+        alpha.memoit(memo, beta.path)
+        for _ in range(ticks):
+            doist.recur()
+        assert not alpha.txms
+        assert not alpha.txgs
+        assert beta.caught == [(memo, alpha.path, None)]
+        assert not beta.rxgs
+        doist.exit()
+
     """Done Test"""
 
 